@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+################################################################################
+# @file      matcher.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   benchmark
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Per-answer grading cost of the trainer.
+# 
+#   python3 -m benchmark.matcher [LANG] [REPEAT]
+
+import re, sys
+import timeit
+from unidecode import unidecode
+
+from src.matcher import matcher, facultative_words, HINT_RATIO
+
+
+WORDS = ["la maison", "el ordenador", "hablar", "la canción", "el árbol", "desafortunadamente", "los ciudadanos"]
+
+# wrong answers: exact, accent missing, one insertion, one deletion, transposition, unrelated
+def answers(word: str) -> dict:
+	return {
+		"correct": word,
+		"typo": unidecode(word),
+		"insertion": word[:2] + "x" + word[2:],
+		"deletion": word[:2] + word[3:],
+		"transposition": word[:1] + word[2] + word[1] + word[3:],
+		"incorrect": "zzzzzzzz",
+	}
+
+
+def legacy_grade(lang: str, word: str, answer: str) -> str:
+	"""Grading as train_vocabulary used to do it, for comparison."""
+	lword = re.sub(r"^("+ facultative_words[lang] +r")\s+", "", word.strip().lower()).strip()
+	luser = answer.lower()
+	lword = re.sub(r"^("+ facultative_words[lang] +r")\s+", "", lword)
+	luser = re.sub(r"^("+ facultative_words[lang] +r")\s+", "", luser)
+	ulword = unidecode(lword)
+	uluser = unidecode(luser)
+	count = sum(1 for a, b in zip(ulword, luser) if a != b) + abs(len(ulword) - len(luser))
+	almost = 1 + (len(ulword) / HINT_RATIO)
+	if lword == re.sub(r"^(el|le|la|un(a|e)?|du) ", "", luser):
+		return "correct"
+	elif ulword == uluser:
+		return "typo"
+	elif count <= almost:
+		return "almost"
+	return "incorrect"
+
+
+if __name__ == "__main__":
+	lang = sys.argv[1] if len(sys.argv) > 1 else "es"
+	repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+	m = matcher(lang)
+
+	print(f"{'word':<20s} {'answer':<14s} {'legacy':>10s} {'grade':>10s} {'legacy µs':>10s} {'µs':>8s}")
+	for word in WORDS:
+		target = m.target(word)
+		for kind, answer in answers(target.lword).items():
+			legacy = timeit.timeit(lambda: legacy_grade(lang, word, answer), number=repeat) / repeat * 1e6
+			current = timeit.timeit(lambda: m.grade(target, answer), number=repeat) / repeat * 1e6
+			print(f"{word:<20s} {kind:<14s} {legacy_grade(lang, word, answer):>10s} {m.grade(target, answer):>10s} {legacy:>10.2f} {current:>8.2f}")
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+################################################################################
+# @file      sentences.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   benchmark
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Startup time and throughput of the sentence splitters, on a long document.
+# The Argos model is only measured when the pair's package is installed.
+# 
+#   python3 -m benchmark.sentences [FROM] [TO] [SIZE]
+
+import sys
+import time
+
+from src.sentences import RuleSentencizer
+
+
+PARAGRAPH = (
+	"Mr. Brown arrived at 9 a.m. on Monday. He had left the U.S. two days earlier! "
+	"Did he bring the documents, e.g. the contracts and the invoices? Nobody knew. "
+	"Dr. Smith, who works at St. Mary's hospital, said: \"We will see.\" Then she left. "
+	"The meeting, planned for Jan. 5, was moved to the end of the month… It was a surprise. "
+)
+
+
+def measure(name: str, make, text: str):
+	start = time.perf_counter()
+	splitter = make()
+	splitter.split_sentences("Warm up. Done.")
+	startup = time.perf_counter() - start
+
+	start = time.perf_counter()
+	sentences = splitter.split_sentences(text)
+	elapsed = time.perf_counter() - start
+	print(f"{name:<8s} {startup * 1000:>11.1f} {len(text) / elapsed / 1e6:>12.2f} {len(sentences):>10d}")
+	return sentences
+
+
+if __name__ == "__main__":
+	_from = sys.argv[1] if len(sys.argv) > 1 else "en"
+	_to = sys.argv[2] if len(sys.argv) > 2 else "es"
+	size = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+	text = PARAGRAPH * size
+
+	print(f"{'splitter':<8s} {'startup ms':>11s} {'MB/s':>12s} {'sentences':>10s}")
+	rules = measure("rules", lambda: RuleSentencizer(_from), text)
+
+	try:
+		from src.translate_text import load_translation, set_sentencizer
+		set_sentencizer("argos")
+		translation = load_translation(_from, _to)
+		layer = getattr(translation, "underlying", translation)
+	except Exception as e:
+		print(f"argos: not available ({e})", file=sys.stderr)
+		sys.exit(0)
+
+	argos = measure("argos", lambda: layer.argos_sentencizer, text)
+	same = len(set(rules) & set(s.strip() for s in argos))
+	print(f"agreement: {same / max(len(rules), len(argos)) * 100:.1f}% of sentences identical")
@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+################################################################################
+# @file      trainer.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   benchmark
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Trainer loop driven by a simulated learner, offline and reproducible.
+# 
+# The learner answers correctly, with a typo, almost, wrongly or skips, at the
+# given rates. Sessions run on a synthetic wordlist (or the pair's frequency
+# list with --pair) with a throwaway journal, a new session starting whenever
+# every word is learnt. Reported: turns/s, trainer time per card (the
+# learner's own time excluded), memory growth, and scheduling fairness: how
+# evenly new words are drawn, and how many cards a failed word waits before
+# coming back (RETRY_FAILED when on time).
+# 
+# Every card is made on demand from the seeded generator, so a seed replays
+# the same run; --prefetch prepares them on the trainer's background thread
+# instead, as the terminal does (the order then depends on thread timing).
+# 
+# --pipe types the answers into the real slot prompt through prompt_toolkit's
+# pipe input, to measure the whole terminal path (latin alphabets only).
+# 
+#   python3 -m benchmark.trainer [--turns N] [--words N] [--correct P] [--typo P] [--almost P] [--skip P]
+#                                [--seed N] [--pair FROM TO] [--prefetch] [--pipe] [--tracemalloc]
+
+import os
+import argparse
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+from unidecode import unidecode
+
+from src.journal import Journal
+from src.matcher import ALMOST
+from src.train import Trainer, load_wordlist, keyboard_answers, RETRY_FAILED
+
+
+LETTERS = "abcdefghijklmnoprstuvéèàçñ"
+
+
+def synthetic_wordlist(size: int, rng: random.Random) -> dict:
+	word = lambda: "".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 12)))
+	return {f"{word()}{i}": word() for i in range(size)}
+
+
+class Learner:
+	"""Answer source with fixed rates per kind of answer; the rest is wrong."""
+	def __init__(self, trainer: Trainer, correct: float, typo: float, almost: float, skip: float, rng: random.Random):
+		self.trainer = trainer
+		self.rates = ((correct, "correct"), (typo, "typo"), (almost, "almost"), (skip, "skip"))
+		self.rng = rng
+
+	def answer(self, expected: str) -> str:
+		draw = self.rng.random()
+		for rate, kind in self.rates:
+			if draw < rate:
+				break
+			draw -= rate
+		else:
+			kind = "incorrect"
+
+		if kind == "correct":
+			return expected
+		if kind == "typo":
+			return unidecode(expected)
+		if kind == "almost":
+			i = self.rng.randrange(len(expected))
+			return expected[:i] + ("x" if expected[i] != "x" else "y") + expected[i + 1:]
+		if kind == "skip":
+			return ""
+		return "q" * len(expected)
+
+	def __call__(self, card) -> str:
+		return self.answer(self.trainer.expected(card))
+
+
+def pipe_answers(learner: Learner, pipe, ask):
+	"""Type the learner's answers into the slot prompt: the letters the hints don't fill, then Enter."""
+	def ask_pipe(card) -> str | None:
+		text = learner(card)
+		if not text:
+			pipe.send_text("\x18")	# c-x: skip
+		else:
+			lword = card.target.lword
+			keys = "".join(c for i, c in enumerate(text[:len(lword)]) if i not in card.visible_slots)
+			pipe.send_text(keys + "\r")
+		return ask(card)
+	return ask_pipe
+
+
+def percentile(values: list[float], p: float) -> float:
+	return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def jain(counts: list[int]) -> float:
+	"""Jain's fairness index: 1 when every word is drawn as often, 1/n when one is drawn every time."""
+	total = sum(counts)
+	return total * total / (len(counts) * sum(c * c for c in counts)) if total else 1.0
+
+
+def run(args, ask_for=None) -> dict:
+	rng = random.Random(args.seed)
+	_from, _to = args.pair or ("xx", "yy")
+	wordlist = load_wordlist(_from, _to) if args.pair else synthetic_wordlist(args.words, rng)
+
+	latencies = []
+	fresh = dict.fromkeys(wordlist, 0)	# times drawn other than as a retry
+	failed_at = {}
+	gaps = []
+	turns = sessions = 0
+
+	with tempfile.TemporaryDirectory() as tmp:
+		start = time.perf_counter()
+		while turns < args.turns:
+			journal_path = os.path.join(tmp, f"journal-{sessions}.jsonl")
+			journal = Journal(journal_path, journal_path + ".json", legacy_path=None)
+			trainer = Trainer(_from, _to, journal=journal, wordlist=wordlist, rng=rng, prefetch=args.prefetch)
+			learner = Learner(trainer, args.correct, args.typo, args.almost, args.skip, rng)
+			ask = ask_for(learner) if ask_for else learner
+			sessions += 1
+			failed_at.clear()
+			try:
+				while turns < args.turns:
+					t = time.perf_counter()
+					card = trainer.next_card()
+					overhead = time.perf_counter() - t
+					if card is None:
+						break
+					if card.word in failed_at:
+						gaps.append(len(latencies) + 1 - failed_at.pop(card.word))
+					else:
+						fresh[card.word] += 1
+
+					grade = ALMOST
+					while grade == ALMOST and turns < args.turns:
+						user_answer = ask(card)
+						t = time.perf_counter()
+						if not user_answer:
+							trainer.skip(card)
+							grade = None
+						else:
+							grade = trainer.answer(card, user_answer)
+						overhead += time.perf_counter() - t
+						turns += 1
+					t = time.perf_counter()
+					trainer.step()
+					latencies.append(overhead + time.perf_counter() - t)
+					if card.word in trainer.failed:
+						failed_at[card.word] = len(latencies)
+			finally:
+				trainer.close()
+		elapsed = time.perf_counter() - start
+
+	latencies.sort()
+	gaps.sort()
+	return dict(
+		turns=turns, sessions=sessions, elapsed=elapsed, latencies=latencies,
+		gaps=gaps, starved=len(failed_at), fairness=jain([c for c in fresh.values()]),
+	)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(prog="benchmark.trainer", description="Trainer loop driven by a simulated learner.")
+	parser.add_argument("--turns", type=int, default=200000, help="answers to simulate")
+	parser.add_argument("--words", type=int, default=5000, help="size of the synthetic wordlist")
+	parser.add_argument("--correct", type=float, default=0.6)
+	parser.add_argument("--typo", type=float, default=0.1)
+	parser.add_argument("--almost", type=float, default=0.1)
+	parser.add_argument("--skip", type=float, default=0.05)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--pair", nargs=2, metavar=("FROM", "TO"), help="use the pair's frequency list")
+	parser.add_argument("--prefetch", action="store_true", help="prepare cards on a background thread (not reproducible)")
+	parser.add_argument("--pipe", action="store_true", help="answer through the prompt_toolkit slot prompt")
+	parser.add_argument("--tracemalloc", action="store_true", help="trace Python allocations (slower)")
+	args = parser.parse_args()
+
+	if args.tracemalloc:
+		tracemalloc.start()
+	rss_start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+	if args.pipe:
+		from prompt_toolkit.application import create_app_session
+		from prompt_toolkit.input import create_pipe_input
+		from prompt_toolkit.output import DummyOutput
+		with create_pipe_input() as pipe, create_app_session(input=pipe, output=DummyOutput()):
+			_from, _to = args.pair or ("xx", "yy")
+			result = run(args, lambda learner: pipe_answers(learner, pipe, keyboard_answers(_from, _to)))
+	else:
+		result = run(args)
+
+	latencies = result["latencies"]
+	gaps = result["gaps"]
+	print(f"{result['turns']} turns, {len(latencies)} cards, {result['sessions']} sessions in {result['elapsed']:.1f}s: {result['turns'] / result['elapsed']:.0f} turns/s")
+	print(f"trainer time per card   p50 {percentile(latencies, 50) * 1e6:.1f}µs  p90 {percentile(latencies, 90) * 1e6:.1f}µs  p99 {percentile(latencies, 99) * 1e6:.1f}µs  max {latencies[-1] * 1e6:.1f}µs")
+	print(f"max RSS growth          {(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_start) / 1024:.1f} MB")
+	if args.tracemalloc:
+		current, peak = tracemalloc.get_traced_memory()
+		print(f"traced memory           {current / 1e6:.2f} MB now, {peak / 1e6:.2f} MB peak")
+	print(f"fairness of new words   {result['fairness']:.3f} (Jain index of draws per word)")
+	if gaps:
+		print(f"failed word comes back  p50 {percentile(gaps, 50)}  p99 {percentile(gaps, 99)}  min {gaps[0]}  max {gaps[-1]} cards later (RETRY_FAILED = {RETRY_FAILED}), {result['starved']} still waiting")
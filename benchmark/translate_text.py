@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+################################################################################
+# @file      translate_text.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   benchmark
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Throughput and quality of the Argos inference profiles, on a fixed corpus.
+# Quality is the chrF agreement of each profile with the "quality" profile.
+# 
+#   python3 -m benchmark.translate_text [FROM] [TO] [REPEAT]
+
+import sys
+import time
+from collections import Counter
+
+from src.translate_text import load_translation, set_profile, TRANSLATE_PROFILES
+
+
+CORPUS = [
+	"The train leaves at seven o'clock tomorrow morning.",
+	"I would like a cup of coffee with a little milk, please.",
+	"She has been learning to play the piano since she was a child.",
+	"We should have booked the hotel before the prices went up.",
+	"Could you tell me where the nearest pharmacy is?",
+	"The museum is closed on Mondays, but the garden stays open.",
+	"If it rains this weekend, we will stay at home and read.",
+	"My brother works in a hospital near the river.",
+	"They did not understand why the meeting had been cancelled.",
+	"Learning a new language takes time, patience and a lot of practice.",
+	"The children were playing in the street when the storm started.",
+	"Do not forget to water the plants while I am away.",
+]
+TEXT = "\n\n".join(CORPUS)
+
+
+def chrf(hypothesis: str, reference: str, max_n: int = 6, beta: float = 2.0) -> float:
+	"""Character n-gram F-score (chrF), 0 to 100."""
+	hypothesis, reference = hypothesis.replace(" ", ""), reference.replace(" ", "")
+	precisions, recalls = [], []
+	for n in range(1, max_n + 1):
+		hyp = Counter(hypothesis[i:i + n] for i in range(len(hypothesis) - n + 1))
+		ref = Counter(reference[i:i + n] for i in range(len(reference) - n + 1))
+		if not hyp or not ref:
+			continue
+		common = sum((hyp & ref).values())
+		precisions.append(common / sum(hyp.values()))
+		recalls.append(common / sum(ref.values()))
+	if not precisions:
+		return 0.0
+	p, r = sum(precisions) / len(precisions), sum(recalls) / len(recalls)
+	return 0.0 if p + r == 0 else 100 * (1 + beta**2) * p * r / (beta**2 * p + r)
+
+
+if __name__ == "__main__":
+	_from = sys.argv[1] if len(sys.argv) > 1 else "en"
+	_to = sys.argv[2] if len(sys.argv) > 2 else "es"
+	repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+	translation = load_translation(_from, _to)
+	tokens = len(TEXT.split())
+
+	outputs = {}
+	print(f"{'profile':<10s} {'load s':>8s} {'tokens/s':>10s} {'chrF':>7s}")
+	for name in ["quality"] + [p for p in TRANSLATE_PROFILES if p != "quality"]:
+		set_profile(name)
+		start = time.perf_counter()
+		translation.translate(CORPUS[0])			# loads the model with this profile
+		load = time.perf_counter() - start
+
+		elapsed = 0.0
+		for _ in range(repeat):
+			translation.cache = {}				# argos caches translated paragraphs
+			start = time.perf_counter()
+			outputs[name] = translation.translate(TEXT)
+			elapsed += time.perf_counter() - start
+		score = chrf(outputs[name], outputs["quality"])
+		print(f"{name:<10s} {load:>8.2f} {tokens * repeat / elapsed:>10.1f} {score:>7.1f}")
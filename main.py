@@ -23,15 +23,39 @@ if __name__ == "__main__":
 	parser = argparse.ArgumentParser(prog="language-learning-cli", description="A CLI tool for language learning.")
 	parser.add_argument('FROM', nargs="?")
 	parser.add_argument('TO', nargs="?")
-	parser.add_argument('WORD', metavar="WORD | TEXT", nargs="?")
+	parser.add_argument('WORD', metavar="WORD | TEXT | VERB", nargs="*")
 	parser.add_argument('-c', '--conjugation', action='store_true', help='Conjugate verbs')
 	parser.add_argument('-w', '--translate-word', action='store_true', help='Translate word')
 	parser.add_argument('-t', '--translate-text', action='store_true', help='Translate text')
+	parser.add_argument('-i', '--interactive', action='store_true', help='Interactive lookup shell (w, c, t commands)')
+	parser.add_argument('--deadline', dest="DEADLINE", type=parse_duration, metavar="DURATION", help='Latency budget of a dictionary or conjugation lookup (e.g. 800ms, 2s; default: LOOKUP_DEADLINE in .env, else none): past it, answer from local sources')
+	parser.add_argument('--refresh', dest="REFRESH", nargs="?", const=0, type=int, metavar="LIMIT", help='Revalidate the cached dictionary and conjugation pages due for it (at most LIMIT)')
 
 	parser_translate_word = parser.add_argument_group("Translate Word")
 	parser_translate_word.add_argument('-f', '--compound-forms', dest="COMPOUND", action='store_true', help='Include compound forms')
 	parser_translate_word.add_argument('-o', '--compact', dest="COMPACT", action='store_true', help='Compact translate word output (without examples)')
 	parser_translate_word.add_argument('-m', '--main', dest="MAIN", action='store_true', help='Main translation only (first results)')
+	parser_translate_word.add_argument('--format', dest="FORMAT", choices=OUTPUT_FORMATS, default="ansi", help='Output format: terminal (ansi), the WordReference data (json), or one meaning per line (ndjson, tsv)')
+
+	parser_translate_word.add_argument('-e', '--examples', dest="EXAMPLES", action='store_true', help='Example sentences containing WORD, from the local corpus (offline)')
+	parser_translate_word.add_argument('--import-examples', dest="IMPORT_EXAMPLES", metavar="FILE", help='Import a corpus of FROM<TAB>TO sentence pairs into the local corpus')
+
+	parser_conjugation = parser.add_argument_group("Conjugation")
+	parser_conjugation.add_argument('-L', '--languages', dest="LANGUAGES", help='Compare in these languages, comma separated, verbs given in the first (default: TO,FROM)')
+	parser_conjugation.add_argument('--output', dest="OUTPUT", help='Write the comparison to a markdown (.md) or CSV (.csv) file')
+
+	parser_translate_text = parser.add_argument_group("Translate Text")
+	parser_translate_text.add_argument('-p', '--profile', dest="PROFILE", choices=TRANSLATE_PROFILES, help='Inference profile (default: TRANSLATE_PROFILE in .env, else balanced)')
+	parser_translate_text.add_argument('--sentencizer', dest="SENTENCIZER", choices=SENTENCIZERS, help='Sentence splitter: rule-based, or the Argos model (default: TRANSLATE_SENTENCIZER in .env, else rules)')
+
+	parser_packs = parser.add_argument_group("Language packs")
+	parser_packs.add_argument('--export-pack', dest="EXPORT_PACK", metavar="FILE", help='Pack the caches, wordlists and translation models of FROM, TO and the languages given after them into FILE, for offline hosts')
+	parser_packs.add_argument('--import-pack', dest="IMPORT_PACK", metavar="FILE", help='Install a language pack, read when first needed')
+
+	parser_train = parser.add_argument_group("Train Vocabulary")
+	parser_train.add_argument('-x', '--context', dest="CONTEXT", action='store_true', help='Show an example sentence for each word (fetched in background)')
+	parser_train.add_argument('--build-wordlist', dest="BUILD_WORDLIST", action='store_true', help="Build TO's wordlist by translating FROM's frequency list with Argos (resumable)")
+	parser_train.add_argument('-C', '--train-conjugation', dest="TRAIN_CONJUGATION", action='store_true', help='Drill conjugations of the verbs already conjugated (offline)')
 	args = parser.parse_args()
 
 	# print(args)
@@ -40,22 +64,57 @@ if __name__ == "__main__":
 
 	_from = (os.getenv("DEFAULT_LANGUAGE_FROM", "en") if args.FROM is None else args.FROM).strip().lower()
 	_to = (os.getenv("DEFAULT_LANGUAGE_TO", "es") if args.TO is None else args.TO).strip().lower()
+	set_profile(args.PROFILE)
+	set_sentencizer(args.SENTENCIZER)
+	set_deadline(args.DEADLINE)
+
+	if args.interactive:
+		lookup_shell(_from, _to)
+
+	elif args.REFRESH is not None:
+		refresh_cached(args.REFRESH or None)
 
-	if args.conjugation:
-		conjugation_table(_from, _to, args.WORD)
+	elif args.IMPORT_PACK:
+		import_pack(args.IMPORT_PACK)
+
+	elif args.EXPORT_PACK:
+		export_pack(args.EXPORT_PACK, [_from, _to] + [l.strip().lower() for l in args.WORD])
+
+	elif args.conjugation:
+		try:
+			if len(args.WORD) > 1 or args.LANGUAGES or args.OUTPUT:
+				languages = [l.strip().lower() for l in args.LANGUAGES.split(",")] if args.LANGUAGES else [_to, _from]
+				conjugation_comparison(languages, args.WORD, args.OUTPUT)
+			else:
+				conjugation_table(_from, _to, args.WORD[0] if args.WORD else None)
+		except ConjugationError as e:
+			print(f"Error: {e}", file=sys.stderr)
+			sys.exit(1)
 
 	elif _from == _to:
 		print("FROM and TO are the same language", file=sys.stderr)
 		sys.exit(1)
 
+	elif args.IMPORT_EXAMPLES:
+		import_examples(_from, _to, args.IMPORT_EXAMPLES)
+
+	elif args.EXAMPLES:
+		show_examples(_from, _to, " ".join(args.WORD))
+
 	elif args.translate_word:
-		translate_word(_from, _to, args.WORD, args.COMPOUND, args.COMPACT, args.MAIN)
+		translate_word(_from, _to, " ".join(args.WORD), args.COMPOUND, args.COMPACT, args.MAIN, output_format=args.FORMAT)
 		# print(json.dumps(WordReference(_from, _to).translate(args.translate_word)))
 
 	elif args.translate_text:
-		translate_text(_from, _to, args.WORD)
+		translate_text(_from, _to, " ".join(args.WORD))
 		# print(json.dumps(WordReference(_from, _to).translate(args.translate_word)))
 
+	elif args.BUILD_WORDLIST:
+		build_wordlist(_from, _to)
+
+	elif args.TRAIN_CONJUGATION:
+		train_conjugation(_from, _to)
+
 	else:
-		train_vocabulary(_from, _to)
+		train_vocabulary(_from, _to, args.CONTEXT)
 
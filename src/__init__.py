@@ -15,7 +15,14 @@
 ################################################################################
 
 
-from .conjugation import conjugation_table
+from .build_wordlist import build_wordlist
+from .compare import conjugation_comparison
+from .conjugation import conjugation_table, ConjugationError
+from .examples import show_examples, import_examples
+from .packs import export_pack, import_pack
+from .pages import refresh_cached, set_deadline, parse_duration
+from .shell import lookup_shell
 from .train import train_vocabulary
-from .translate import translate_word
-from .translate_text import translate_text
+from .train_conjugation import train_conjugation
+from .translate import translate_word, OUTPUT_FORMATS
+from .translate_text import translate_text, set_profile, set_sentencizer, TRANSLATE_PROFILES, SENTENCIZERS
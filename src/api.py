@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+################################################################################
+# @file      api.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Asynchronous API, for embedding in a service: nothing is printed, nothing
+# exits, results are returned as plain data and failures raised.
+# 
+#   await lookup("es", "en", "comer")         WordReference entry
+#   await conjugate("fr", "es", "comer")      conjugation tables of a verb
+#   await translate("en", "fr", "Hello")      machine translation
+#   trainer = await Trainer.open("en", "ru", learner="alice")  one learner's vocabulary session
+# 
+# The work runs in threads (asyncio.to_thread) over the same process-wide
+# pieces as the CLI: the pooled HTTP session (fetch.py), the on-disk caches,
+# and the loaded Argos models, so concurrent callers share connections,
+# cached entries and models. The CLI commands are renderers over the same
+# data functions (`word_data`, `conjugation_data`), correcting the word with
+# messages where the API corrects it silently (`normalise`).
+
+import asyncio
+import threading
+import time
+
+from .conjugation import conjugation_data, ConjugationError
+from .forms import analyse_form
+from .fuzzy import fuzzy_index
+from .journal import SKIPPED, learner_journal
+from .matcher import CORRECT, TYPO, ALMOST
+from .pages import set_background_refresh
+from .train import Trainer as _Trainer
+from .translate import word_data
+from .translate_text import load_translation
+
+
+# The embedding service outlives its requests: due pages are revalidated in the background
+set_background_refresh()
+
+
+class WordNotFound(LookupError):
+	"""The dictionary has no entry for the word."""
+
+
+class PairNotAvailable(LookupError):
+	"""No dictionary for the language pair, even through the pivot language."""
+
+
+def normalise(lang: str, word: str) -> str:
+	"""What the CLI looks up for `word`: the infinitive of a rare inflected form,
+	else the spelling correction from the wordlist, else `word` itself.
+	"""
+	try:
+		index = fuzzy_index(lang)
+	except FileNotFoundError:
+		index = None
+	if index is not None and index.known(word):
+		return word
+	analysis = analyse_form(lang, word)
+	if analysis is not None:
+		return analysis[0]
+	if index is not None and " " not in word.strip():
+		return index.correct(word) or word
+	return word
+
+
+def _lookup(_from: str, _to: str, word: str) -> dict:
+	try:
+		return word_data(_from, _to, normalise(_from, word))
+	except NotImplementedError as e:
+		raise PairNotAvailable(str(e)) from None
+	except NameError as e:
+		raise WordNotFound(str(e)) from None
+
+
+async def lookup(_from: str, _to: str, word: str) -> dict:
+	"""WordReference data of `word` (see `translate.word_data`). Raise WordNotFound or PairNotAvailable."""
+	return await asyncio.to_thread(_lookup, _from, _to, word)
+
+
+def _conjugate(_from: str, _to: str, verb: str | None) -> dict:
+	verb, data, verb_from, data_from = conjugation_data(_from, _to, normalise(_to, verb) if verb else None)
+	return dict(
+		verb=verb,
+		verb_from=verb_from,
+		tables=data.dict(),
+		tables_from=None if data_from is None else data_from.dict(),
+	)
+
+
+async def conjugate(_from: str, _to: str, verb: str | None = None) -> dict:
+	"""Conjugation of `verb` in `_to` (`tables`, mood -> tense -> pronoun -> form)
+	and of its translation in `_from` (`tables_from`, None past a deadline). Raise ConjugationError.
+	"""
+	return await asyncio.to_thread(_conjugate, _from, _to, verb)
+
+
+# `load_translation` is cached, but two threads missing the cache at once would both load the model
+_models_lock = threading.Lock()
+
+
+def _translate(_from: str, _to: str, text: str) -> str:
+	with _models_lock:
+		translation = load_translation(_from, _to)
+	return translation.translate(text)
+
+
+async def translate(_from: str, _to: str, text: str) -> str:
+	"""Machine translation of `text` with the installed (or downloaded) Argos model."""
+	return await asyncio.to_thread(_translate, _from, _to, text)
+
+
+class Trainer:
+	"""Vocabulary session of one learner, one card at a time:
+
+		trainer = await Trainer.open("en", "ru", learner="alice")
+		while (card := await trainer.next()) is not None:
+			result = await trainer.answer(reply)	# until not result["retry"]
+		await trainer.close()
+	"""
+	def __init__(self, trainer: _Trainer):
+		self.trainer = trainer
+		self.card = None
+		self.shown = 0.0
+
+	@classmethod
+	async def open(cls, _from: str, _to: str, examples: bool = False, learner: str | None = None) -> "Trainer":
+		"""Session of `learner`, with their own answer history (None: the CLI user's). Raise
+		ValueError for an id that is not a plain file name.
+		"""
+		def start():
+			journal = learner_journal(learner) if learner is not None else None
+			return _Trainer(_from, _to, examples, journal=journal)
+		return cls(await asyncio.to_thread(start))
+
+	async def next(self) -> dict | None:
+		"""The next card, or None when every word is learnt. The pending card is skipped."""
+		if self.card is not None:
+			await self.skip()
+		card = await asyncio.to_thread(self.trainer.next_card)
+		if card is None:
+			return None
+		self.card = card
+		self.shown = time.perf_counter()
+		return dict(
+			word=card.word,
+			length=len(card.target.lword),
+			hints=card.visible_slots,
+			note=card.note,
+			example=card.example,
+		)
+
+	async def answer(self, text: str) -> dict:
+		"""Grade `text` for the pending card. With `retry`, the same card waits for another answer."""
+		if self.card is None:
+			raise RuntimeError("No card pending, call next() first")
+		card = self.card
+		expected = self.trainer.expected(card)
+		latency = time.perf_counter() - self.shown
+		if not text:
+			await asyncio.to_thread(self.trainer.skip, card, latency)
+			grade = SKIPPED
+		else:
+			grade = await asyncio.to_thread(self.trainer.answer, card, text, latency)
+		retry = grade == ALMOST
+		if not retry:
+			self.card = None
+			self.trainer.step()
+		return dict(
+			grade=grade,
+			correct=grade in (CORRECT, TYPO),
+			expected=None if retry else expected,
+			retry=retry,
+		)
+
+	async def skip(self) -> str | None:
+		"""Give up on the pending card; return the expected answer."""
+		if self.card is None:
+			return None
+		return (await self.answer(""))["expected"]
+
+	async def close(self):
+		await asyncio.to_thread(self.trainer.close)
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		await self.close()
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+################################################################################
+# @file      build_wordlist.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Wordlist for a language without a frequency list, machine-translated from an
+# existing one with the installed Argos model.
+# 
+# Rows are translated in chunks by a pool of processes, each with its own model
+# and share of the cores. Every finished chunk is appended to a checkpoint
+# file, so an interrupted build resumes where it stopped. The result is stored
+# as the language's column of the concept matrix (aligned with the source by
+# construction), and its "did you mean" index is built:
+# 
+#   ~/.cache/language-learning/wordlist/build/<from>-<to>.tsv   "row\ttranslation" checkpoint lines
+
+import os, sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .fuzzy import fuzzy_index
+from .translate_text import load_translation, translate_words, _thread_budget
+from .wordlist import column, write_column, WORDLIST_PATH, MATRIX_PATH
+
+
+BUILD_PATH = os.path.join(MATRIX_PATH, "build")
+CHUNK_ROWS = 512
+BUILD_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+
+
+def _load_checkpoint(path: str) -> dict:
+	try:
+		with open(path, "rb+") as f:
+			data = f.read()
+			# A line cut by a crash is dropped (and its chunk redone), so appends start on a new line
+			end = data.rfind(b"\n") + 1
+			f.truncate(end)
+	except FileNotFoundError:
+		return {}
+	done = {}
+	for line in data[:end].decode("utf-8").splitlines():
+		row, _, word = line.partition("\t")
+		done[int(row)] = word
+	return done
+
+
+_worker = {}
+
+
+def _init_worker(_from: str, _to: str):
+	_worker["translation"] = load_translation(_from, _to)
+
+
+def _translate_chunk(rows: list[int], words: list[str]) -> list[tuple[int, str]]:
+	return list(zip(rows, translate_words(_worker["translation"], words)))
+
+
+def build_wordlist(_from: str, _to: str, workers: int = BUILD_WORKERS):
+	"""Translate `_from`'s frequency list into a `_to` column, resuming an interrupted build."""
+	if os.path.exists(os.path.join(WORDLIST_PATH, _to + ".txt")):
+		print(f"Error: '{_to}' already has a frequency list.", file=sys.stderr)
+		sys.exit(1)
+	try:
+		source = list(column(_from))
+	except FileNotFoundError:
+		print(f"Error: No frequency list for '{_from}'.", file=sys.stderr)
+		sys.exit(1)
+
+	# Each worker gets its share of the cores, read by the profile when the model is loaded
+	os.environ["TRANSLATE_THREADS"] = str(max(1, _thread_budget() // workers))
+	# Installs the Argos package if needed, before the workers load it
+	load_translation(_from, _to)
+
+	os.makedirs(BUILD_PATH, exist_ok=True)
+	checkpoint = os.path.join(BUILD_PATH, f"{_from}-{_to}.tsv")
+	done = _load_checkpoint(checkpoint)
+	todo = [row for row in range(len(source)) if row not in done]
+	print(f"{len(source)} rows, {len(done)} already translated, {len(todo)} to go ({workers} workers)")
+
+	if todo:
+		start = time.perf_counter()
+		count = 0
+		with open(checkpoint, "a", encoding="utf-8") as f, \
+				ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(_from, _to)) as pool:
+			chunks = [todo[i:i + CHUNK_ROWS] for i in range(0, len(todo), CHUNK_ROWS)]
+			futures = [pool.submit(_translate_chunk, rows, [source[r] for r in rows]) for rows in chunks]
+			for future in as_completed(futures):
+				translated = future.result()
+				f.write("".join(f"{row}\t{word.replace(chr(9), ' ').replace(chr(10), ' ')}\n" for row, word in translated))
+				f.flush()
+				os.fsync(f.fileno())
+				done.update(translated)
+				count += len(translated)
+				elapsed = time.perf_counter() - start
+				print(f"\r{len(done)}/{len(source)} rows, {count / elapsed:.0f} rows/s", end="", flush=True)
+		print()
+
+	write_column(_to, [done[row] for row in range(len(source))])
+	fuzzy_index(_to)
+	os.remove(checkpoint)
+	print(f"Wordlist '{_to}' built from '{_from}' ({len(source)} rows)")
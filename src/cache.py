@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+################################################################################
+# @file      cache.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+import os, json
+import threading
+
+from .packs import pack_json, pack_stamp
+from .storage import user_path, shared_path, locked, read_json, write_json
+
+
+COMPACT_MIN = 1 << 16	# bytes of log kept before folding it into the JSON file
+
+
+class JsonCache:
+	"""Dictionary persisted as `~/.cache/language-learning/<name...>.json`, layered over
+	the same file in the system-wide cache and in the language packs. Loaded lazily on
+	first access.
+
+	`set` appends the entry to `<name...>.log` (one JSON line); once the log outgrows
+	the JSON file (COMPACT_MIN at least), it is folded into it (locked, atomic), so
+	writing n entries costs O(n log n) bytes instead of a rewrite per entry.
+	"""
+	def __init__(self, *name: str):
+		self.name = name
+		self.path = user_path(*name) + ".json"
+		self.log = user_path(*name) + ".log"
+		self.lock = threading.Lock()
+		self.data = None
+		self.mtime = None
+		self.log_offset = 0
+
+	def _mtime(self) -> int | None:
+		try:
+			return os.stat(self.path).st_mtime_ns
+		except FileNotFoundError:
+			return None
+
+	def _read_log(self, data: dict, start: int = 0, path: str | None = None) -> int:
+		"""Apply the complete lines of the log (`path`, default the user's) from `start` to
+		`data`; return where they end.
+		"""
+		try:
+			with open(path or self.log, "rb") as f:
+				if os.fstat(f.fileno()).st_size < start:
+					start = 0	# folded meanwhile
+				f.seek(start)
+				chunk = f.read()
+		except FileNotFoundError:
+			return 0
+		end = start
+		for line in chunk.splitlines(keepends=True):
+			if not line.endswith(b"\n"):
+				break		# still being written
+			end += len(line)
+			try:
+				key, value = json.loads(line)
+			except ValueError:
+				continue
+			data[key] = value
+		return end
+
+	def _load(self) -> dict:
+		if self.data is None:
+			self.data = pack_json(*self.name)
+			self.data.update(read_json(shared_path(*self.name) + ".json", {}))
+			self._read_log(self.data, path=shared_path(*self.name) + ".log")
+			self.mtime = self._mtime()
+			self.data.update(read_json(self.path, {}))
+			self.log_offset = self._read_log(self.data)
+		return self.data
+
+	def _catch_up(self):
+		mtime = self._mtime()
+		if mtime != self.mtime:
+			# Folded by another process: the log starts over
+			self.mtime = mtime
+			self.data.update(read_json(self.path, {}))
+			self.log_offset = self._read_log(self.data)
+		else:
+			self.log_offset = self._read_log(self.data, self.log_offset)
+
+	def reload(self):
+		"""Take in the entries written by other processes since the files were last read."""
+		with self.lock:
+			if self.data is None:
+				self._load()
+			else:
+				self._catch_up()
+
+	def __contains__(self, key: str) -> bool:
+		with self.lock:
+			return key in self._load()
+
+	def get(self, key: str, default=None):
+		with self.lock:
+			return self._load().get(key, default)
+
+	def items(self) -> list:
+		with self.lock:
+			return list(self._load().items())
+
+	def stamp(self) -> list:
+		"""Modification times of the files behind the cache, to tell when derived data is stale."""
+		return pack_stamp(*self.name) + [os.path.getmtime(p) if os.path.exists(p) else None for p in (shared_path(*self.name) + ".json", shared_path(*self.name) + ".log", self.path, self.log)]
+
+	def _compact(self):
+		"""Fold the log into the JSON file; the lock of `path` is held."""
+		user = read_json(self.path, {})
+		self._read_log(user)
+		write_json(self.path, user)
+		# A crash before the truncation only replays entries already in the file
+		open(self.log, "w").close()
+		self.mtime = self._mtime()
+		self.data.update(user)
+		self.log_offset = 0
+
+	def set(self, key: str, value):
+		with self.lock:
+			self._load()[key] = value
+			line = json.dumps([key, value], ensure_ascii=False) + "\n"
+			with locked(self.path):
+				# One append, not synced: a lost entry is only fetched again
+				with open(self.log, "a", encoding="utf-8") as f:
+					f.write(line)
+					size = f.tell()
+				try:
+					compact = size > max(COMPACT_MIN, os.path.getsize(self.path))
+				except FileNotFoundError:
+					compact = size > COMPACT_MIN
+				if compact:
+					self._compact()
+				else:
+					# Other processes' entries appended since, and ours
+					self._catch_up()
@@ -0,0 +1,196 @@
+#!/usr/bin/python3
+################################################################################
+# @file      compare.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Side-by-side conjugation of several verbs in several languages.
+# 
+# Verbs are given in the first language, translated to the others, and all
+# (language, verb) tables are fetched concurrently. Each tense of the first
+# language becomes one table, with the tenses of the other languages aligned
+# through CONJUGATION_LINKS, one row per person:
+# 
+#   | Person  | Hablar (ES) | Parler (FR) | Comer (ES) | Manger (FR) |
+# 
+# Rendered in the terminal, or written as markdown (`time/fr-es.md`) or CSV.
+
+import sys, csv
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console
+from rich.table import Table
+
+from .conjugation import fetch_conjugation, persons, short_names, CONJUGATION_LINKS, DEFAULT_VERB, ConjugationError
+from .forms import resolve_form
+from .fuzzy import spellcheck
+from .pages import NO_ANSWER, deadline
+from .translate import lookup_word, first_meaning, local_translation
+
+
+MAX_WORKERS = 8
+
+
+def linked_tense(base: str, lang: str, tense: str) -> str | None:
+	"""Key of `lang`'s tense matching `base`'s `tense` ("Indicativo.Presente" -> "Indicatif.Présent")."""
+	if lang == base:
+		return tense
+	links = CONJUGATION_LINKS.get(base + lang)
+	if links and tense in links:
+		return links[tense]
+	links = CONJUGATION_LINKS.get(lang + base, {})
+	return next((k for k, v in links.items() if v == tense), None)
+
+
+def _translate_verb(base: str, lang: str, verb: str) -> str | None:
+	if lang == base:
+		return verb
+	try:
+		return first_meaning(lookup_word(base, lang, verb))
+	except (NameError, NotImplementedError):
+		return None
+	except NO_ANSWER:
+		local = local_translation(base, lang, verb)
+		return local[0][0] if local else None
+
+
+def _fetch_table(lang: str, verb: str):
+	"""Conjugation table, None when missing, or when Reverso did not answer (in time)."""
+	try:
+		return fetch_conjugation(lang, verb)
+	except NO_ANSWER:
+		return None
+
+
+def tense_rows(data, key: str | None) -> list[tuple[str, str]]:
+	"""(pronoun, conjugation) rows of a tense, [] when missing."""
+	value = data.get(key) if data is not None and key else None
+	return list(value.items()) if isinstance(value, dict) else []
+
+
+def by_person(lang: str, rows: list[tuple[str, str]]) -> dict:
+	"""`{row key: (pronoun, conjugation)}`, the key being the person (PRONOUNS index) when
+	the pronoun is known, else the position in the tense ("#0").
+	"""
+	keyed = {}
+	for i, row in enumerate(rows):
+		person = next((p for p in persons(row[0], lang) if p not in keyed), None)
+		keyed[f"#{i}" if person is None else person] = row
+	return keyed
+
+
+def compare_conjugations(langs: list[str], verbs: list[str]) -> dict:
+	"""Aligned tables `{tense title: (header, rows)}`, one column per (verb, language).
+	`verbs` are in `langs[0]`, translated to the other languages.
+	"""
+	base = langs[0]
+	verbs = [resolve_form(base, verb) or spellcheck(base, verb) for verb in verbs]
+
+	with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+		translated = {
+			(verb, lang): executor.submit(contextvars.copy_context().run, _translate_verb, base, lang, verb)
+			for verb in verbs for lang in langs
+		}
+		translated = {k: f.result() for k, f in translated.items()}
+		tables = {
+			k: executor.submit(contextvars.copy_context().run, _fetch_table, k[1], v) if v else None
+			for k, v in translated.items()
+		}
+		tables = {k: f.result() if f else None for k, f in tables.items()}
+
+	columns = [(verb, lang) for verb in verbs for lang in langs]
+	for verb, lang in columns:
+		if tables[verb, lang] is None:
+			print(f"Error: Unable to fetch conjugation data for '{translated[verb, lang] or verb}' in language '{lang}'.", file=sys.stderr)
+
+	reference = next((tables[verb, base] for verb in verbs if tables[verb, base] is not None), None)
+	if reference is None:
+		return {}
+
+	header = ["Person"] + [f"{translated[c].capitalize()} ({c[1].upper()})" if translated[c] else f"- ({c[1].upper()})" for c in columns]
+	result = {}
+	for mood in reference:
+		for tense in reference[mood]:
+			key = f"{mood}.{tense}"
+			keys = {lang: linked_tense(base, lang, key) for lang in langs}
+			if any(keys[lang] is None for lang in langs):
+				continue
+			# Lined up by person, not position: "il/elle/on" next to "él/ella/usted"
+			cells = [by_person(lang, tense_rows(tables[verb, lang], keys[lang])) for verb, lang in columns]
+			order = sorted({k for c in cells for k in c if isinstance(k, int)})
+			order += dict.fromkeys(k for c in cells for k in c if isinstance(k, str))
+			rows = []
+			for person in order:
+				pronouns = []
+				for c in cells:
+					pronoun = c[person][0].strip().capitalize() if person in c else ""
+					if pronoun and pronoun not in pronouns:
+						pronouns.append(pronoun)
+				rows.append([", ".join(pronouns)] + [c[person][1] if person in c else "" for c in cells])
+			result[mood if tense == mood else f"{mood} {tense}"] = (header, rows)
+	return result
+
+
+def to_markdown(tables: dict) -> str:
+	out = []
+	for title, (header, rows) in tables.items():
+		widths = [max(len(r[i]) for r in [header] + rows) for i in range(len(header))]
+		line = lambda cells: "| " + " | ".join(c.ljust(w) for c, w in zip(cells, widths)) + " |"
+		out.append(f"## {title}\n")
+		out.append(line(header))
+		out.append("| " + " | ".join("-" * w for w in widths) + " |")
+		out.extend(line(r) for r in rows)
+		out.append("")
+	return "\n".join(out)
+
+
+def write_csv(tables: dict, f):
+	writer = csv.writer(f)
+	header_written = False
+	for title, (header, rows) in tables.items():
+		if not header_written:
+			writer.writerow(["Tense"] + header)
+			header_written = True
+		writer.writerows([title] + r for r in rows)
+
+
+def conjugation_comparison(langs: list[str], verbs: list[str], output: str | None = None):
+	for lang in langs:
+		if lang not in short_names:
+			raise ConjugationError(f"Language '{lang}' not supported for Reverso conjugation.")
+	if not verbs:
+		if langs[0] not in DEFAULT_VERB:
+			raise ConjugationError("No verb given.")
+		verbs = [DEFAULT_VERB[langs[0]]]
+
+	with deadline():
+		tables = compare_conjugations(langs, verbs)
+	if not tables:
+		raise ConjugationError(f"Unable to fetch conjugation data for {', '.join(verbs)}.")
+
+	if output is None:
+		console = Console()
+		for title, (header, rows) in tables.items():
+			table = Table(title=title.upper())
+			table.add_column(header[0], justify="left", style="bold")
+			for h in header[1:]:
+				table.add_column(h, justify="left")
+			for r in rows:
+				table.add_row(*r)
+			console.print(table)
+	elif output.endswith(".csv"):
+		with open(output, "w", encoding="utf-8", newline="") as f:
+			write_csv(tables, f)
+	else:
+		with open(output, "w", encoding="utf-8") as f:
+			f.write(to_markdown(tables))
@@ -16,11 +16,16 @@
 
 from email.mime import base
 import sys, re
+from functools import cache
 from benedict import benedict
 from rich.console import Console
 from rich.table import Table
 from rich.text import Text
-from .translate import translate_word
+import requests
+from .forms import resolve_form, add_forms
+from .fuzzy import spellcheck
+from .pages import PageCache, DeadlineExceeded, NO_ANSWER, deadline
+from .translate import lookup_word, first_meaning, local_translation
 
 
 DEFAULT_VERB = {
@@ -29,7 +34,8 @@ DEFAULT_VERB = {
 }
 
 from bs4 import BeautifulSoup
-import requests
+
+REVERSO_URL = "https://conjugator.reverso.net/conjugation-{language}-verb-{verb}.html"
 
 short_names = {
 	"en": "English",
@@ -99,6 +105,29 @@ def parse_conjugation_data(html_string):
 		pass
 
 
+def _parse_conjugation(html: str, verb: str) -> dict | None:
+	data = parse_conjugation_data(html)
+	return None if data is None else data.dict()
+
+
+@cache
+def _conjugation_cache(lang: str) -> PageCache:
+	return PageCache(
+		("reverso", lang),
+		lambda verb: REVERSO_URL.format(language=short_names.get(lang, lang), verb=verb),
+		_parse_conjugation,
+		lambda verb, data: add_forms(lang, verb, data),
+	)
+
+
+def fetch_conjugation(lang: str, verb: str) -> benedict | None:
+	"""Parsed Reverso conjugation of `verb`, cached per language. None if Reverso has no table.
+	Raise NO_ANSWER's exceptions when it is not cached and Reverso did not answer.
+	"""
+	data = _conjugation_cache(lang).get(verb.strip().lower())
+	return None if data is None else benedict(data)
+
+
 def _shared_prefix_suffix(strings: list[str]) -> tuple[int, int]:
 	"""Return (prefix_len, suffix_len) common to all strings in the list.
 	If list is empty return (0,0).
@@ -321,26 +350,29 @@ CONJUGATION_LINKS = {
 # }
 
 
-def link_pronouns(pronoun: str, from_code: str, to_code: str) -> str:
+def persons(pronoun: str, lang: str) -> list[int]:
+	"""Persons (indexes in PRONOUNS[lang]) a Reverso pronoun ("que je ", "j'", "él/ella/usted ")
+	can stand for, [] if unknown. English "you" is both the 2nd singular and plural.
+	"""
+	pronouns = PRONOUNS.get(lang, [])
 	if pronoun.startswith("qu'"):
 		pronoun = pronoun[3:]
-	pronoun = pronoun.strip().split(' ')[-1]
-	# print("Linking pronoun:", pronoun, from_code, "->", to_code)
-	from_pronouns = PRONOUNS.get(from_code, [])
+	# "que je", "je me": the first word from the end that is a pronoun
+	for word in reversed(pronoun.strip().split(' ')):
+		if word.endswith("'"):
+			word = word[:-1] + "e"	# j' -> je
+		found = [i for i, p in enumerate(pronouns) if word == p]
+		if not found:
+			found = [i for i, p in enumerate(pronouns) if word.split('/')[0] == p.split('/')[0]]
+		if found:
+			return found
+	return []
+
+
+def link_pronouns(pronoun: str, from_code: str, to_code: str) -> str:
 	to_pronouns = PRONOUNS.get(to_code, [])
-	if pronoun in from_pronouns:
-		# print("Found pronoun:", pronoun)
-		index = from_pronouns.index(pronoun)
-		if index < len(to_pronouns):
-			return to_pronouns[index]
-		return ""
-	base = pronoun.split('/')[0]
-	# print("Base pronoun:", base)
-	for i, p in enumerate(from_pronouns):
-		if base == p.split('/')[0]:
-			if i < len(to_pronouns):
-				return to_pronouns[i]
-	return ""
+	found = [i for i in persons(pronoun, from_code) if i < len(to_pronouns)]
+	return to_pronouns[found[0]] if found else ""
 
 def reverse_link_pronouns(data_from: dict, path: str, pronoun_from: str) -> str:
 	def __pronoun_replace(match: re.Match) -> str:
@@ -355,43 +387,62 @@ def reverse_link_pronouns(data_from: dict, path: str, pronoun_from: str) -> str:
 	return data_from.get(f"{path}.{re.sub(r"qu(?:e\s+|')|/(on|as|usted(es)?)$", __pronoun_replace, pronoun_from)} ")
 
 
-def conjugation_table(_from: str, _to: str, verb: str | None = None, time: str|None=None):
-	if _to not in short_names and _to not in short_names.values():
-		print(f"Error: Language '{_to}' not supported for Reverso conjugation.", file=sys.stderr)
-		sys.exit(1)
-
-# Get conjugation in target language
-	language = short_names[_to] or _to
-	verb = verb if verb is not None else DEFAULT_VERB[_to]
-
-	d = requests.get(
-		f"https://conjugator.reverso.net/conjugation-{language}-verb-{verb}.html",
-		headers={"User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"}
-	).text
+class ConjugationError(Exception):
+	"""Conjugation unavailable: unsupported language or verb unknown to Reverso."""
 
-	data = parse_conjugation_data(d)
-	if data is None:
-		print(f"Error: Unable to fetch conjugation data for verb '{verb}' in language '{_to}'.", file=sys.stderr)
-		sys.exit(1)
 
-		# print(data)
-
-# Get conjugation in source language
-	verb_from = translate_word(_to, _from, verb, get_first_string=True)
-	language = short_names[_from] or _from
+def conjugation_data(_from: str, _to: str, verb: str | None = None) -> tuple[str, benedict, str, benedict]:
+	"""(verb, its conjugation in `_to`, its translation in `_from`, that conjugation). Raise ConjugationError.
+	`verb` is conjugated as given, nothing printed: correcting it is up to the caller (see
+	`conjugation_table`, `api.normalise`). Past the deadline or offline, the `_from` side is
+	what could be found: the translation may come from local sources, and its conjugation be None.
+	"""
+	if _to not in short_names and _to not in short_names.values():
+		raise ConjugationError(f"Language '{_to}' not supported for Reverso conjugation.")
 
-	# print(verb_from)
+# Get conjugation in target language
+	if verb is None and _to not in DEFAULT_VERB:
+		raise ConjugationError("No verb given.")
+	if verb is None:
+		verb = DEFAULT_VERB[_to]
+
+	with deadline():
+		try:
+			data = fetch_conjugation(_to, verb)
+		except DeadlineExceeded:
+			raise ConjugationError(f"No answer from Reverso for '{verb}' within the deadline, the table is cached when it arrives.") from None
+		except requests.RequestException as e:
+			raise ConjugationError(f"No answer from Reverso for '{verb}' ({e}), and no cached table.") from None
+		if data is None:
+			raise ConjugationError(f"Unable to fetch conjugation data for verb '{verb}' in language '{_to}'.")
+
+	# Get conjugation in source language
+		late = False
+		try:
+			verb_from = first_meaning(lookup_word(_to, _from, verb))
+		except (NameError, NotImplementedError):
+			verb_from = None
+		except NO_ANSWER:
+			local = local_translation(_to, _from, verb)
+			verb_from = local[0][0] if local else None
+			late = True
+
+		try:
+			data_from = fetch_conjugation(_from, verb_from) if verb_from else None
+		except NO_ANSWER:
+			data_from = None
+			late = True
+	if data_from is None and not late:
+		raise ConjugationError(f"Unable to fetch conjugation data for verb '{verb}' in language '{_to}'.")
+	return verb, data, verb_from, data_from
 
-	d = requests.get(
-		f"https://conjugator.reverso.net/conjugation-{language}-verb-{verb_from}.html",
-		headers={"User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"}
-	).text
 
-	data_from = parse_conjugation_data(d) #{"": None, "": None, "": None, "": None, "": None, "": None, "": None, "": None, "": None, "": None, "": None, "": None} # parse_conjugation_data(d)
+def conjugation_table(_from: str, _to: str, verb: str | None = None, time: str|None=None):
+	if verb is not None:
+		verb = resolve_form(_to, verb) or spellcheck(_to, verb)
+	verb, data, verb_from, data_from = conjugation_data(_from, _to, verb)
 	if data_from is None:
-		print(f"Error: Unable to fetch conjugation data for verb '{verb}' in language '{_to}'.", file=sys.stderr)
-		sys.exit(1)
-
+		print(f"\x1b[33m'{_from}' forms not available, '{verb}' shown alone\x1b[0m", file=sys.stderr)
 
 	# print(data_from["Subjonctif"], data["Subjuntivo"].keys())
 	conj_lnk_lang = _from+_to if _from+_to in CONJUGATION_LINKS else _to+_from
@@ -448,7 +499,7 @@ def conjugation_table(_from: str, _to: str, verb: str | None = None, time: str|N
 							CONJUGATION_LINKS[conj_lnk_lang].get(mood)
 						# if conj_lnk_key:
 						# 	print(len(data[mood][submood]), data_from.get(conj_lnk_key+"."), data_from.get(conj_lnk_key))
-						if conj_lnk_key:
+						if conj_lnk_key and data_from is not None:
 							# there is data in the from language
 							# print("Indicative" in data_from, "Present" in data_from["Indicative"], type(data_from), data_from[f"{conj_lnk_key}"], "'"+pronoun_from+"'")
 							if pronoun and pronoun_from:
@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+################################################################################
+# @file      examples.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Offline corpus of example sentence pairs, with an inverted index.
+# 
+# Sentences come from WordReference lookups (kept as they are fetched, and
+# back-filled from the lookup cache) and from imported TSV corpora. Each pair
+# of languages has its own SQLite database:
+# 
+#   sentences(id, source, target)   the pairs, ids increasing with insertion
+#   postings(term, first, last,     sentence ids of each term (both sides) in
+#            count, ids)            blocks of at most BLOCK ids, delta-encoded
+#                                   varints, keyed by their first id
+# 
+# Appending sentences appends new blocks to their terms; the short blocks a
+# term collects over several imports or lookups are merged when the import is
+# done (compaction). A query reads the (first, last) directory of each term
+# and intersects on the fly: it walks the rarest term and only decodes the
+# blocks of the other terms that may hold its next candidate, so it stops
+# after `limit` matches without reading the common terms in full.
+
+import os, sys, re
+import sqlite3
+from bisect import bisect_left
+from contextlib import closing
+from functools import cache
+from unidecode import unidecode
+
+from .cache import JsonCache
+from .packs import extract
+from .storage import PATH_CACHE
+
+
+EXAMPLES_PATH = os.path.join(PATH_CACHE, "examples")
+MAX_RESULTS = 10
+IMPORT_BATCH = 20000	# sentences per transaction
+BLOCK = 128	# ids per postings block
+
+TERM = re.compile(r"\w+")
+
+
+def terms(text: str) -> set[str]:
+	return set(TERM.findall(unidecode(text.lower())))
+
+
+def encode_postings(ids: list[int], last: int = 0) -> bytes:
+	"""Varint deltas of increasing `ids`, following `last`."""
+	out = bytearray()
+	for i in ids:
+		delta = i - last
+		last = i
+		while delta >= 0x80:
+			out.append((delta & 0x7f) | 0x80)
+			delta >>= 7
+		out.append(delta)
+	return bytes(out)
+
+
+def decode_postings(blob: bytes):
+	"""Iterate the ids encoded by `encode_postings`."""
+	last = value = shift = 0
+	for byte in blob:
+		value |= (byte & 0x7f) << shift
+		if byte & 0x80:
+			shift += 7
+		else:
+			last += value
+			yield last
+			value = shift = 0
+
+
+class ExampleIndex:
+	"""Sentence pairs of `_from` -> `_to` and their inverted index."""
+	def __init__(self, _from: str, _to: str):
+		self._from, self._to = _from, _to
+		self.path = os.path.join(EXAMPLES_PATH, _from + _to + ".db")
+		created = extract("examples", _from + _to + ".db") is None
+		os.makedirs(EXAMPLES_PATH, exist_ok=True)
+		with closing(self.connect()) as db, db:
+			db.execute("CREATE TABLE IF NOT EXISTS sentences (id INTEGER PRIMARY KEY, source TEXT NOT NULL, target TEXT NOT NULL, UNIQUE (source, target))")
+			# One blob per term in earlier corpora: dropped, indexed again below
+			outdated = "count" not in {row[1] for row in db.execute("PRAGMA table_info(postings)")}
+			if outdated:
+				db.execute("DROP TABLE IF EXISTS postings")
+			db.execute("CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, first INTEGER NOT NULL, last INTEGER NOT NULL, count INTEGER NOT NULL, ids BLOB NOT NULL, PRIMARY KEY (term, first)) WITHOUT ROWID")
+			if outdated:
+				self._reindex(db)
+		if created:
+			# Examples of the words looked up before the corpus existed
+			self.add(
+				example
+				for _, data in JsonCache("wordreference", _from + _to).items() if data
+				for example in wordreference_examples(data)
+			)
+
+	def connect(self) -> sqlite3.Connection:
+		db = sqlite3.connect(self.path, timeout=30)
+		db.execute("PRAGMA journal_mode=WAL")
+		return db
+
+	def _write_blocks(self, db: sqlite3.Connection, term: str, ids: list[int]):
+		for i in range(0, len(ids), BLOCK):
+			block = ids[i:i + BLOCK]
+			db.execute(
+				"INSERT INTO postings (term, first, last, count, ids) VALUES (?, ?, ?, ?, ?)",
+				(term, block[0], block[-1], len(block), encode_postings(block))
+			)
+
+	def _reindex(self, db: sqlite3.Connection):
+		postings = {}
+		for i, source, target in db.execute("SELECT id, source, target FROM sentences ORDER BY id"):
+			for term in terms(source) | terms(target):
+				postings.setdefault(term, []).append(i)
+		for term, ids in postings.items():
+			self._write_blocks(db, term, ids)
+
+	def _add_batch(self, db: sqlite3.Connection, pairs: list[tuple[str, str]], touched: set) -> int:
+		postings = {}
+		added = 0
+		for source, target in pairs:
+			cursor = db.execute("INSERT OR IGNORE INTO sentences (source, target) VALUES (?, ?)", (source, target))
+			if cursor.rowcount:
+				added += 1
+				for term in terms(source) | terms(target):
+					postings.setdefault(term, []).append(cursor.lastrowid)
+
+		# New blocks only: the ids are above every id already indexed
+		for term, ids in postings.items():
+			self._write_blocks(db, term, ids)
+		touched.update(postings)
+		return added
+
+	def _compact(self, db: sqlite3.Connection, touched: set):
+		"""Merge the runs of short blocks of the `touched` terms."""
+		for term in touched:
+			run = []
+			blocks = db.execute("SELECT first, count FROM postings WHERE term = ? ORDER BY first", (term,)).fetchall()
+			for first, count in blocks + [(None, BLOCK)]:
+				if count < BLOCK:
+					run.append(first)
+					continue
+				if len(run) > 1:
+					ids = []
+					for first_id in run:
+						blob = db.execute("SELECT ids FROM postings WHERE term = ? AND first = ?", (term, first_id)).fetchone()[0]
+						ids.extend(decode_postings(blob))
+						db.execute("DELETE FROM postings WHERE term = ? AND first = ?", (term, first_id))
+					self._write_blocks(db, term, ids)
+				run = []
+
+	def add(self, pairs) -> int:
+		"""Store (source, target) pairs, streamed; return how many were new."""
+		added = 0
+		batch = []
+		touched = set()
+		with closing(self.connect()) as db:
+			for pair in pairs:
+				batch.append(pair)
+				if len(batch) >= IMPORT_BATCH:
+					with db:
+						added += self._add_batch(db, batch, touched)
+					batch = []
+			if batch:
+				with db:
+					added += self._add_batch(db, batch, touched)
+			if touched:
+				with db:
+					self._compact(db, touched)
+		return added
+
+	def search(self, query: str, limit: int = MAX_RESULTS) -> list[tuple[str, str]]:
+		"""Pairs containing every term of `query`, oldest first."""
+		wanted = terms(query)
+		if not wanted:
+			return []
+		with closing(self.connect()) as db:
+			lists = [_Postings(db, term) for term in wanted]
+			if not all(lists):
+				return []
+			# Leapfrog from the rarest term: every other term skips to the candidate or past it
+			lists.sort(key=lambda p: p.count)
+			rarest, others = lists[0], lists[1:]
+			ids = []
+			candidate = rarest.seek(0)
+			while candidate is not None:
+				for postings in others:
+					found = postings.seek(candidate)
+					if found != candidate:
+						candidate = None if found is None else rarest.seek(found)
+						break
+				else:
+					ids.append(candidate)
+					if len(ids) >= limit:
+						break
+					candidate = rarest.seek(candidate + 1)
+			if not ids:
+				return []
+			rows = dict(
+				(row[0], row[1:])
+				for row in db.execute(f"SELECT id, source, target FROM sentences WHERE id IN ({','.join('?' * len(ids))})", ids)
+			)
+		return [rows[i] for i in ids]
+
+
+class _Postings:
+	"""Cursor over the ids of a term, decoding one block at a time."""
+	def __init__(self, db: sqlite3.Connection, term: str):
+		self.db, self.term = db, term
+		directory = db.execute("SELECT first, last, count FROM postings WHERE term = ? ORDER BY first", (term,)).fetchall()
+		self.firsts = [row[0] for row in directory]
+		self.lasts = [row[1] for row in directory]
+		self.count = sum(row[2] for row in directory)
+		self.block = -1
+		self.ids = []
+		self.pos = 0
+
+	def __bool__(self):
+		return self.count > 0
+
+	def seek(self, target: int) -> int | None:
+		"""First id >= `target`, None past the end; `target` never decreases."""
+		if self.block < 0 or target > self.lasts[self.block]:
+			self.block = bisect_left(self.lasts, target, max(self.block, 0))
+			if self.block == len(self.lasts):
+				return None
+			blob = self.db.execute("SELECT ids FROM postings WHERE term = ? AND first = ?", (self.term, self.firsts[self.block])).fetchone()[0]
+			self.ids = list(decode_postings(blob))
+			self.pos = 0
+		self.pos = bisect_left(self.ids, target, self.pos)
+		return self.ids[self.pos]
+
+
+@cache
+def example_index(_from: str, _to: str) -> ExampleIndex:
+	return ExampleIndex(_from, _to)
+
+
+def wordreference_examples(data: dict):
+	for translation in data["translations"]:
+		for entry in translation["entries"]:
+			if entry["from_example"] and entry["to_example"]:
+				yield entry["from_example"].strip(), " / ".join(e.strip() for e in entry["to_example"])
+
+
+def store_examples(_from: str, _to: str, data: dict):
+	"""Keep the examples of a WordReference result."""
+	example_index(_from, _to).add(wordreference_examples(data))
+
+
+def _read_tsv(path: str):
+	with open(path, "r", encoding="utf-8") as f:
+		for line in f:
+			source, sep, target = line.rstrip("\n").partition("\t")
+			if sep and source.strip() and target.strip():
+				yield source.strip(), target.split("\t")[0].strip()
+
+
+def import_examples(_from: str, _to: str, path: str):
+	"""Import a bilingual corpus, one `source<TAB>target` pair per line."""
+	try:
+		added = example_index(_from, _to).add(_read_tsv(path))
+	except FileNotFoundError:
+		print(f"Error: '{path}' not found.", file=sys.stderr)
+		sys.exit(1)
+	print(f"{added} new sentence pairs imported into '{_from} > {_to}'")
+
+
+def show_examples(_from: str, _to: str, word: str, limit: int = MAX_RESULTS):
+	results = example_index(_from, _to).search(word, limit)
+	if not results:
+		print(f"No example for '{word}'", file=sys.stderr)
+		return
+	pattern = re.compile("|".join(re.escape(w) for w in word.split()), re.IGNORECASE)
+	for source, target in results:
+		print(pattern.sub(lambda m: f"\x1b[1m{m.group(0)}\x1b[0;2m", f"\x1b[2m{source}\x1b[0m"))
+		print(f"\x1b[3m{target}\x1b[0m\n")
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+################################################################################
+# @file      fetch.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+POOL_SIZE = 32	# connections kept per host, for concurrent callers of the API
+REQUEST_TIMEOUT = 10	# seconds
+
+# One pooled session for the whole process, so repeated lookups reuse connections
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENT})
+# WordReference answers a JS cookie challenge (HTTP 418) without it
+SESSION.cookies.set("nginx_wr_human", "1", domain=".wordreference.com")
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+
+
+def fetch_html(url: str) -> str:
+	return SESSION.get(url, timeout=REQUEST_TIMEOUT).text
+
+
+def fetch_conditional(url: str, validators: dict | None = None, **kwargs) -> tuple[str | None, dict]:
+	"""GET `url`, conditional on the `validators` ({"etag", "last_modified"}) of the copy
+	already held. Return (html, validators of the response); html is None on
+	304 Not Modified. Raise requests.HTTPError on an error status.
+	"""
+	headers = {}
+	if validators:
+		if validators.get("etag"):
+			headers["If-None-Match"] = validators["etag"]
+		if validators.get("last_modified"):
+			headers["If-Modified-Since"] = validators["last_modified"]
+	response = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs)
+	if response.status_code == 304:
+		return None, {
+			"etag": response.headers.get("ETag", validators.get("etag")),
+			"last_modified": response.headers.get("Last-Modified", validators.get("last_modified")),
+		}
+	response.raise_for_status()
+	return response.text, {
+		"etag": response.headers.get("ETag"),
+		"last_modified": response.headers.get("Last-Modified"),
+	}
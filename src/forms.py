@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+################################################################################
+# @file      forms.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Inverted index of inflected forms: "comíamos" -> comer (Indicativo, Pretérito
+# imperfecto, nosotros).
+# 
+# Built from every conjugation table in the Reverso cache (plus the English
+# irregular verbs list). Forms and their analyses are stored as columns (see
+# wordlist.py) with an open-addressing hash table over the forms, all
+# memory-mapped, so a lookup is a hash and a probe:
+# 
+#   ~/.cache/language-learning/forms/<lang>.keys.col     lowercase forms
+#   ~/.cache/language-learning/forms/<lang>.values.col   "infinitive\tmood\ttense\tperson" lines
+#   ~/.cache/language-learning/forms/<lang>.idx          MAGIC | size | slots[size] (form id + 1, 0 = empty)
+#   ~/.cache/language-learning/forms/<lang>.delta        [verb, table] lines, cached since the build
+# 
+# A table newly cached is appended to the delta (`add_forms`, the conjugation
+# cache's `stored` hook) and looked up from memory next to the index; the index
+# is only rebuilt once DELTA_VERBS tables have piled up, or when a pack or the
+# shared cache changes.
+
+import os, sys, json
+import csv
+import mmap
+import zlib
+from array import array
+
+from .cache import JsonCache
+from .packs import pack_stamp
+from .storage import PATH_CACHE, shared_path, locked, atomic_write, read_json, write_json
+from .wordlist import Column, write_column_file, HEADER
+
+
+FORMS_PATH = os.path.join(PATH_CACHE, "forms")
+IRREGULAR_PATH = os.path.join(os.path.dirname(__file__), "en-irregular.csv")
+INDEX_MAGIC = b"LLH1"
+MAX_ANALYSES = 8	# per form, e.g. "parle" is je/il, indicatif/subjonctif
+DELTA_VERBS = 256	# tables cached since the build before the index is rebuilt
+
+
+def _hash(s: str) -> int:
+	return zlib.crc32(s.encode("utf-8"))
+
+
+def _verb_analyses(verb: str, data: dict):
+	"""(form, infinitive, mood, tense, person) of the forms of one conjugation table."""
+	for mood, tenses in data.items():
+		for tense, persons in tenses.items():
+			for person, form in persons.items():
+				form = form.strip().lower()
+				if form:
+					yield form, verb, mood, tense, person.strip()
+					# Compound tenses: the participle alone is worth finding too
+					if " " in form:
+						yield form.rsplit(" ", 1)[1], verb, mood, tense, person.strip()
+
+
+def _analyses(lang: str, conjugations: JsonCache):
+	"""(form, infinitive, mood, tense, person) of every known conjugated form."""
+	for verb, data in conjugations.items():
+		if data:
+			yield from _verb_analyses(verb, data)
+
+	if lang == "en" and os.path.exists(IRREGULAR_PATH):
+		with open(IRREGULAR_PATH, "r", encoding="utf-8") as f:
+			for row in csv.DictReader(f, delimiter=";"):
+				for tense in ("Preterite", "Past Participle"):
+					for form in row[tense].replace(",", "/").split("/"):
+						if form.strip():
+							yield form.strip().lower(), row["Infinitive"], "Indicative", tense, ""
+
+
+def build_index(path: str, analyses):
+	"""Write the index files of `analyses` under `path` + suffixes."""
+	values = {}
+	for form, *analysis in analyses:
+		entries = values.setdefault(form, [])
+		line = "\t".join(analysis)
+		if line not in entries and len(entries) < MAX_ANALYSES:
+			entries.append(line)
+	keys = list(values)
+
+	size = 1
+	while size < 2 * len(keys):
+		size <<= 1
+	slots = array("I", bytes(4 * size))
+	for i, key in enumerate(keys):
+		slot = _hash(key) & (size - 1)
+		while slots[slot]:
+			slot = (slot + 1) & (size - 1)
+		slots[slot] = i + 1
+
+	write_column_file(path + ".keys.col", keys)
+	write_column_file(path + ".values.col", ["\n".join(values[k]) for k in keys])
+	atomic_write(path + ".idx", HEADER.pack(INDEX_MAGIC, size) + slots.tobytes())
+
+
+class FormIndex:
+	"""Memory-mapped inflected form index, see `build_index`, and the tables of its delta."""
+	def __init__(self, path: str):
+		self.path = path
+		self.keys = Column(path + ".keys.col")
+		self.values = Column(path + ".values.col")
+		with open(path + ".idx", "rb") as f:
+			self.built = os.fstat(f.fileno()).st_mtime_ns
+			self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, self.size = HEADER.unpack_from(self.map, 0)
+		if magic != INDEX_MAGIC:
+			raise ValueError(f"'{path}.idx' is not a form index")
+		self.slots = memoryview(self.map)[HEADER.size:HEADER.size + 4 * self.size].cast("I")
+		self.added = {}		# form -> analyses, from the delta
+		self.delta_verbs = 0
+		self.delta_offset = 0
+
+	def current(self) -> bool:
+		"""Whether the files are still the ones mapped (not rebuilt by another process)."""
+		try:
+			return os.stat(self.path + ".idx").st_mtime_ns == self.built
+		except FileNotFoundError:
+			return False
+
+	def catch_up(self):
+		"""Take in the tables appended to the delta since last read."""
+		try:
+			with open(self.path + ".delta", "rb") as f:
+				f.seek(self.delta_offset)
+				chunk = f.read()
+		except FileNotFoundError:
+			return
+		for line in chunk.splitlines(keepends=True):
+			if not line.endswith(b"\n"):
+				break		# still being written
+			self.delta_offset += len(line)
+			verb, data = json.loads(line)
+			self.delta_verbs += 1
+			for form, *analysis in _verb_analyses(verb, data):
+				entries = self.added.setdefault(form, [])
+				if tuple(analysis) not in entries:
+					entries.append(tuple(analysis))
+
+	def _indexed(self, form: str) -> list[tuple[str, str, str, str]]:
+		if not self.size:
+			return []
+		slot = _hash(form) & (self.size - 1)
+		while self.slots[slot]:
+			i = self.slots[slot] - 1
+			if self.keys[i] == form:
+				return [tuple(line.split("\t")) for line in self.values[i].split("\n")]
+			slot = (slot + 1) & (self.size - 1)
+		return []
+
+	def lookup(self, form: str) -> list[tuple[str, str, str, str]]:
+		"""(infinitive, mood, tense, person) analyses of `form`, [] if unknown."""
+		form = form.strip().lower()
+		analyses = self._indexed(form)
+		for analysis in self.added.get(form, []):
+			if analysis not in analyses:
+				analyses.append(analysis)
+		return analyses[:MAX_ANALYSES]
+
+
+_indexes = {}
+
+
+def _stamp(lang: str) -> list:
+	"""What the user's tables are indexed over: packs, shared cache, irregular verbs list.
+	The user's own tables reach the index through the delta.
+	"""
+	shared = [shared_path("reverso", lang + suffix) for suffix in (".json", ".log")]
+	return pack_stamp("reverso", lang) + [os.path.getmtime(p) if os.path.exists(p) else None for p in shared] \
+		+ [os.path.getmtime(IRREGULAR_PATH) if lang == "en" else None]
+
+
+def _delta_verbs(path: str) -> int:
+	try:
+		with open(path + ".delta", "rb") as f:
+			return sum(1 for _ in f)
+	except FileNotFoundError:
+		return 0
+
+
+def form_index(lang: str) -> FormIndex:
+	"""Index of `lang`, rebuilt when its delta has grown too long or its base has changed."""
+	path = os.path.join(FORMS_PATH, lang)
+	stamp = _stamp(lang)
+
+	index = _indexes.get(lang)
+	if index is not None and index[0] == stamp and index[1].current():
+		index[1].catch_up()
+		if index[1].delta_verbs <= DELTA_VERBS:
+			return index[1]
+
+	if read_json(path + ".json") != stamp or not os.path.exists(path + ".idx") or _delta_verbs(path) > DELTA_VERBS:
+		with locked(path):
+			if read_json(path + ".json") != stamp or not os.path.exists(path + ".idx") or _delta_verbs(path) > DELTA_VERBS:
+				# add_forms appends under the same lock: a table is in the build, the delta, or both
+				build_index(path, _analyses(lang, JsonCache("reverso", lang)))
+				open(path + ".delta", "w").close()
+				write_json(path + ".json", stamp)
+	index = FormIndex(path)
+	index.catch_up()
+	_indexes[lang] = (stamp, index)
+	return index
+
+
+def add_forms(lang: str, verb: str, data: dict | None):
+	"""Index the forms of a newly cached table, without rebuilding the index."""
+	if not data:
+		return
+	path = os.path.join(FORMS_PATH, lang)
+	with locked(path):
+		with open(path + ".delta", "a", encoding="utf-8") as f:
+			f.write(json.dumps([verb, data], ensure_ascii=False) + "\n")
+
+
+def analyse_form(lang: str, word: str) -> tuple[str, str] | None:
+	"""(infinitive, description) of an inflected `word`, from local data only; None when `word` is not a known inflected form."""
+	if not word or " " in word.strip():
+		return None
+	analyses = [a for a in form_index(lang).lookup(word) if a[0].lower() != word.strip().lower()]
+	if not analyses:
+		return None
+	infinitive = analyses[0][0]
+	described = "; ".join(dict.fromkeys(
+		", ".join(p for p in (mood, tense, person) if p)
+		for verb, mood, tense, person in analyses if verb == infinitive
+	))
+	return infinitive, described
+
+
+def resolve_form(lang: str, word: str) -> str | None:
+	"""Infinitive of an inflected `word`, telling the user; None when `word` is not a known inflected form."""
+	analysis = analyse_form(lang, word)
+	if analysis is None:
+		return None
+	infinitive, described = analysis
+	print(f"\x1b[33m'{word}' is a form of '{infinitive}' ({described})\x1b[0m", file=sys.stderr)
+	return infinitive
@@ -0,0 +1,240 @@
+#!/usr/bin/python3
+################################################################################
+# @file      fuzzy.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# "Did you mean" index over the frequency wordlists (symmetric delete).
+# 
+# Every known word is normalised (lowercase, unidecoded) and registered under
+# all the strings obtained by deleting up to MAX_DISTANCE characters. A query
+# only has to generate its own deletes and look them up, then confirm the
+# candidates with a bounded edit distance, so lookup cost does not depend on
+# the size of the list. The delete table is a sorted array of crc32 hashes
+# (collisions only add candidates, rejected by the distance check) stored next
+# to the words, and memory-mapped:
+# 
+#   ~/.cache/language-learning/fuzzy/<lang>.keys.col    normalised words, by frequency
+#   ~/.cache/language-learning/fuzzy/<lang>.forms.col   original spellings of each word, tab separated
+#   ~/.cache/language-learning/fuzzy/<lang>.idx         MAGIC | count | hashes[count] | word ids[count]
+
+import os, sys
+import mmap
+import zlib
+from array import array
+from bisect import bisect_left
+from functools import cache
+from unidecode import unidecode
+
+from .packs import extract
+from .storage import PATH_CACHE, locked, atomic_write, read_json, write_json
+from .wordlist import Column, column, write_column_file, HEADER, _load_manifest
+
+
+MAX_DISTANCE = 2
+SHORT_WORD = 4		# words up to this length are only matched at distance 1
+MAX_SUGGESTIONS = 5
+FUZZY_PATH = os.path.join(PATH_CACHE, "fuzzy")
+INDEX_MAGIC = b"LLF1"
+
+
+def normalize(word: str) -> str:
+	return unidecode(word.strip().lower())
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+	"""Damerau-Levenshtein (optimal string alignment) distance, computed in a band of
+	width `max_distance` around the diagonal. Returns `max_distance + 1` as soon as
+	the distance is known to exceed `max_distance`.
+	"""
+	if a == b:
+		return 0
+	la, lb = len(a), len(b)
+	if abs(la - lb) > max_distance:
+		return max_distance + 1
+
+	# Shared prefix and suffix never change the distance, typos only leave a few letters to compare
+	start = 0
+	while start < la and start < lb and a[start] == b[start]:
+		start += 1
+	end = 0
+	while end < la - start and end < lb - start and a[la - 1 - end] == b[lb - 1 - end]:
+		end += 1
+	a, b = a[start:la - end], b[start:lb - end]
+	la, lb = len(a), len(b)
+	if la == 0 or lb == 0:
+		return min(la + lb, max_distance + 1)
+
+	if la > lb:
+		a, b, la, lb = b, a, lb, la
+
+	over = max_distance + 1
+	prev2 = None
+	prev = [j if j <= max_distance else over for j in range(lb + 1)]
+	for i in range(1, la + 1):
+		row = [over] * (lb + 1)
+		if i <= max_distance:
+			row[0] = i
+		lo = max(1, i - max_distance)
+		hi = min(lb, i + max_distance)
+		best = row[0]
+		ca = a[i - 1]
+		for j in range(lo, hi + 1):
+			cost = 0 if ca == b[j - 1] else 1
+			d = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+			if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1]:
+				d = min(d, prev2[j - 2] + 1)
+			row[j] = d if d <= max_distance else over
+			if d < best:
+				best = d
+		if best > max_distance:
+			return over
+		prev2, prev = prev, row
+	return prev[lb]
+
+
+def _deletes(word: str, distance: int) -> set[str]:
+	result = {word}
+	edge = {word}
+	for _ in range(distance):
+		edge = {w[:i] + w[i + 1:] for w in edge if len(w) > 1 for i in range(len(w))}
+		result |= edge
+	return result
+
+
+def _hash(s: str) -> int:
+	return zlib.crc32(s.encode("utf-8"))
+
+
+def build_index(path: str, words: list[str]):
+	"""Write the index files of `words` (most frequent first) under `path` + suffixes."""
+	forms = {}
+	for word in words:
+		key = normalize(word)
+		if key:
+			spellings = forms.setdefault(key, [])
+			if word not in spellings:
+				spellings.append(word)
+	keys = list(forms)
+
+	pairs = sorted(
+		(_hash(d), i)
+		for i, key in enumerate(keys)
+		for d in _deletes(key, MAX_DISTANCE)
+	)
+	write_column_file(path + ".keys.col", keys)
+	write_column_file(path + ".forms.col", ["\t".join(forms[k]) for k in keys])
+	atomic_write(path + ".idx",
+		HEADER.pack(INDEX_MAGIC, len(pairs))
+		+ array("I", (h for h, _ in pairs)).tobytes()
+		+ array("I", (i for _, i in pairs)).tobytes()
+	)
+
+
+class FuzzyIndex:
+	"""Memory-mapped approximate-match index, see `build_index`."""
+	def __init__(self, path: str):
+		self.keys = Column(path + ".keys.col")
+		self.forms = Column(path + ".forms.col")
+		with open(path + ".idx", "rb") as f:
+			self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, count = HEADER.unpack_from(self.map, 0)
+		if magic != INDEX_MAGIC:
+			raise ValueError(f"'{path}.idx' is not a fuzzy index")
+		view = memoryview(self.map)[HEADER.size:HEADER.size + 8 * count]
+		self.hashes = view[:4 * count].cast("I")
+		self.ids = view[4 * count:].cast("I")
+
+	def _ids(self, variant: str):
+		h = _hash(variant)
+		i = bisect_left(self.hashes, h)
+		while i < len(self.hashes) and self.hashes[i] == h:
+			yield self.ids[i]
+			i += 1
+
+	def _find(self, key: str) -> int | None:
+		return next((i for i in self._ids(key) if self.keys[i] == key), None)
+
+	def known(self, word: str) -> bool:
+		i = self._find(normalize(word))
+		return i is not None and word.strip().lower() in self.forms[i].split("\t")
+
+	def correct(self, word: str) -> str | None:
+		"""Known spelling of `word` when it only differs by case or diacritics."""
+		i = self._find(normalize(word))
+		return None if i is None else self.forms[i].split("\t")[0]
+
+	def suggest(self, word: str, limit: int = MAX_SUGGESTIONS) -> list[str]:
+		"""Closest known words, by edit distance then frequency."""
+		key = normalize(word)
+		max_distance = 1 if len(key) <= SHORT_WORD else MAX_DISTANCE
+		candidates = {}
+		for variant in _deletes(key, max_distance):
+			for i in self._ids(variant):
+				if i not in candidates:
+					candidates[i] = edit_distance(key, self.keys[i], max_distance)
+		ranked = sorted((dist, i) for i, dist in candidates.items() if dist <= max_distance)
+		return [self.forms[i].split("\t")[0] for _, i in ranked[:limit]]
+
+
+@cache
+def fuzzy_index(lang: str) -> FuzzyIndex:
+	"""Index of `lang`'s frequency list, rebuilt only when its concept column changes."""
+	path = os.path.join(FUZZY_PATH, lang)
+	words = column(lang)
+	if not os.path.exists(path + ".json"):
+		# Index shipped in a language pack, the stamp last so that it is only valid once complete
+		for suffix in (".keys.col", ".forms.col", ".idx", ".json"):
+			extract("fuzzy", lang + suffix)
+	# Columns provisioned in the shared cache are not in the user manifest
+	stamp = _load_manifest()["columns"].get(lang, {"rows": len(words), "source": None})
+	if read_json(path + ".json") == stamp:
+		return FuzzyIndex(path)
+
+	# Concurrent processes wait for the first one instead of building the same index
+	with locked(path):
+		if read_json(path + ".json") != stamp:
+			build_index(path, [token.lower() for entry in words for token in entry.split()])
+			write_json(path + ".json", stamp)
+	return FuzzyIndex(path)
+
+
+def known_word(lang: str, word: str) -> bool:
+	"""Whether `word` is in `lang`'s frequency list, as spelled. False without a list."""
+	try:
+		return fuzzy_index(lang).known(word)
+	except FileNotFoundError:
+		return False
+
+
+def spellcheck(lang: str, word: str) -> str:
+	"""Restore case/diacritics of a known word, or print suggestions for an unknown one.
+	Runs before any network request; languages without a wordlist are left unchecked.
+	"""
+	try:
+		index = fuzzy_index(lang)
+	except FileNotFoundError:
+		return word
+
+	if " " in word.strip() or index.known(word):
+		return word
+
+	corrected = index.correct(word)
+	if corrected:
+		print(f"\x1b[33m'{word}' corrected to '{corrected}'\x1b[0m", file=sys.stderr)
+		return corrected
+
+	suggestions = index.suggest(word)
+	if suggestions:
+		print(f"\x1b[33mDid you mean: {', '.join(suggestions)} ?\x1b[0m", file=sys.stderr)
+	return word
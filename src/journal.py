@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+################################################################################
+# @file      journal.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Append-only journal of trainer answers.
+# 
+# Every answer is one JSON line in `journal.jsonl`, appended in batches. The
+# trainer state (words never failed, per pair) is the replay of that log; it
+# is recorded, not used to choose the words of a session. Only the words the
+# former `never_failed.json` lists are left out of the deck, as before.
+# Compaction writes the replayed state to `progress.json` with the journal
+# offset it covers, so later replays only read the tail. The journal itself is
+# kept, for statistics.
+# 
+# Learners served through the API (api.Trainer) have a journal each, under
+# `learners/<learner>/`; the CLI user's is the one at the cache root.
+
+import os, re, json
+import time
+
+from .storage import PATH_CACHE, user_path, locked, read_json, write_json
+from .matcher import CORRECT, TYPO, INCORRECT
+
+
+JOURNAL_PATH = os.path.join(PATH_CACHE, "journal.jsonl")
+SNAPSHOT_PATH = os.path.join(PATH_CACHE, "progress.json")
+LEGACY_PATH = os.path.join(PATH_CACHE, "never_failed.json")
+
+SKIPPED = "skipped"
+LEARNER_ID = re.compile(r"^[\w-][\w.-]*$")
+
+FLUSH_EVERY = 16		# answers
+FLUSH_INTERVAL = 5.0	# seconds
+COMPACT_BYTES = 1 << 18	# journal tail replayed before compacting
+
+
+class Journal:
+	"""Answer log of the trainer, and the state replayed from it."""
+	def __init__(self, path: str = JOURNAL_PATH, snapshot_path: str = SNAPSHOT_PATH, legacy_path: str | None = LEGACY_PATH):
+		self.path = path
+		self.snapshot_path = snapshot_path
+		self.legacy_path = legacy_path
+		self.buffer = []
+		self.last_flush = time.monotonic()
+		self.offset = 0
+		self.never_failed = {}
+		self.failed = {}
+		self._replay()
+
+	def _load_snapshot(self):
+		snapshot = read_json(self.snapshot_path)
+		if snapshot is not None:
+			self.offset = snapshot["offset"]
+			self.never_failed = {k: set(v) for k, v in snapshot["never_failed"].items()}
+			self.failed = {k: set(v) for k, v in snapshot["failed"].items()}
+		else:
+			# First run with a journal: start from the former all-in-one file
+			self.never_failed = {k: set(v) for k, v in read_json(self.legacy_path, {}).items()} if self.legacy_path else {}
+
+	def _apply(self, record: dict):
+		pair, word = record["pair"], record["word"]
+		if record["result"] in (CORRECT, TYPO):
+			if word not in self.failed.get(pair, ()):
+				self.never_failed.setdefault(pair, set()).add(word)
+		elif record["result"] in (INCORRECT, SKIPPED):
+			self.failed.setdefault(pair, set()).add(word)
+			self.never_failed.get(pair, set()).discard(word)
+
+	def _replay_tail(self) -> int:
+		"""Apply the records appended since `offset` (by any process), return the bytes read.
+		Must be called with the journal locked.
+		"""
+		try:
+			with open(self.path, "rb+") as f:
+				f.seek(self.offset)
+				tail = f.read()
+				# A crash can leave a partial last line: it is dropped
+				end = tail.rfind(b"\n") + 1
+				if end != len(tail):
+					f.truncate(self.offset + end)
+		except FileNotFoundError:
+			return 0
+		for line in tail[:end].splitlines():
+			try:
+				self._apply(json.loads(line))
+			except (json.JSONDecodeError, KeyError):
+				pass
+		self.offset += end
+		return end
+
+	def _replay(self):
+		with locked(self.path):
+			self._load_snapshot()
+			replayed = self._replay_tail()
+			if replayed > COMPACT_BYTES:
+				self._write_snapshot()
+
+	def never_failed_words(self, pair: str) -> set:
+		return set(self.never_failed.get(pair, ()))
+
+	def excluded_words(self, pair: str) -> set:
+		"""Words left out of the pair's deck: those of the former never_failed.json."""
+		return set(read_json(self.legacy_path, {}).get(pair, ())) if self.legacy_path else set()
+
+	def record(self, pair: str, word: str, result: str, latency: float):
+		record = {"t": round(time.time(), 3), "pair": pair, "word": word, "result": result, "latency": round(latency, 3)}
+		self._apply(record)
+		self.buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+		if len(self.buffer) >= FLUSH_EVERY or time.monotonic() - self.last_flush >= FLUSH_INTERVAL:
+			self.flush()
+
+	def _append(self):
+		if self.buffer:
+			with open(self.path, "a", encoding="utf-8") as f:
+				f.write("".join(self.buffer))
+			self.buffer = []
+		self.last_flush = time.monotonic()
+
+	def flush(self):
+		with locked(self.path):
+			self._append()
+
+	def _write_snapshot(self):
+		write_json(self.snapshot_path, {
+			"offset": self.offset,
+			"never_failed": {k: sorted(v) for k, v in self.never_failed.items()},
+			"failed": {k: sorted(v) for k, v in self.failed.items()},
+		})
+
+	def compact(self):
+		"""Snapshot the replayed state so the next start skips the journal read so far.
+		Records appended by concurrent sessions are replayed first, so none is lost.
+		"""
+		with locked(self.path):
+			self._append()
+			self._replay_tail()
+			self._write_snapshot()
+
+	def close(self):
+		with locked(self.path):
+			self._append()
+			try:
+				pending = os.path.getsize(self.path) - self.offset
+			except FileNotFoundError:
+				pending = 0
+			if pending > COMPACT_BYTES:
+				self._replay_tail()
+				self._write_snapshot()
+
+
+def learner_journal(learner: str) -> Journal:
+	"""Journal of one learner of the API, kept apart from the others' and the CLI user's."""
+	if not LEARNER_ID.match(learner):
+		raise ValueError(f"Invalid learner id '{learner}' (letters, digits, '_', '-', '.')")
+	return Journal(user_path("learners", learner, "journal.jsonl"), user_path("learners", learner, "progress.json"), None)
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+################################################################################
+# @file      matcher.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+import re
+from functools import cache
+from unidecode import unidecode
+
+from .fuzzy import edit_distance
+
+
+facultative_words = {
+	"fr": r"une?|le(ur)?s?|la|du|des",
+	"en": r"a|the(ir)?s?",
+	"es": r"el|los|las?|sus?",
+}
+
+# Articles accepted in front of any answer, whatever the language
+COMMON_ARTICLES = re.compile(r"^(el|le|la|un(a|e)?|du) ")
+
+HINT_RATIO = 10.0
+
+CORRECT = "correct"
+TYPO = "typo"
+ALMOST = "almost"
+INCORRECT = "incorrect"
+
+
+class Target:
+	"""Expected answer, normalised once when the wordlist is loaded."""
+	__slots__ = ("word", "lword", "ulword", "almost")
+
+	def __init__(self, word: str, lword: str):
+		self.word = word
+		self.lword = lword
+		self.ulword = unidecode(lword)
+		self.almost = int(1 + (len(self.ulword) / HINT_RATIO))
+
+
+class Matcher:
+	"""Answer grading for one target language, with its article pattern compiled once."""
+	def __init__(self, lang: str):
+		self.articles = re.compile(r"^("+ facultative_words[lang] +r")\s+") if lang in facultative_words else None
+
+	def strip(self, s: str) -> str:
+		return self.articles.sub("", s) if self.articles else s
+
+	def target(self, word: str) -> Target:
+		return Target(word, self.strip(word.strip().lower()).strip())
+
+	def grade(self, target: Target, answer: str) -> str:
+		luser = self.strip(answer.lower())
+		if target.lword == COMMON_ARTICLES.sub("", luser):
+			return CORRECT
+
+		uluser = unidecode(luser)
+		if target.ulword == uluser:
+			return TYPO
+
+		if edit_distance(target.ulword, uluser, target.almost) <= target.almost:
+			return ALMOST
+		return INCORRECT
+
+
+@cache
+def matcher(lang: str) -> Matcher:
+	return Matcher(lang)
@@ -0,0 +1,305 @@
+#!/usr/bin/python3
+################################################################################
+# @file      packs.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Language packs: everything a set of languages needs offline, in one archive.
+# 
+# A pack is a zip file laid out like the cache directory, plus a manifest:
+# 
+#   manifest.json                    {"format": 1, "languages": [...], "argos": [...], ...}
+#   wordreference/<from><to>.json    dictionary lookups (and dicts.json)
+#   reverso/<lang>.json              conjugation tables
+#   wordlist/<lang>.col              concept columns (stored, 4-byte aligned: mapped in place)
+#   fuzzy/<lang>.*                   "did you mean" indexes
+#   examples/<from><to>.db           example sentence corpora
+#   argos-packages/<package>/...     Argos translation models
+# 
+# Packs are dropped in `~/.cache/language-learning/packs/` (--import-pack) or
+# in the shared cache's `packs/`, and layered under the shared cache: nothing
+# is read until used. JSON caches are read from the archive, columns are
+# memory-mapped from it, and files that need a path of their own (indexes,
+# SQLite databases, models) are extracted on first use.
+
+import os, sys, json
+import shutil
+import sqlite3
+import struct
+import tempfile
+import time
+import zipfile
+from contextlib import closing
+
+from .storage import user_path, shared_path, locked
+
+
+PACK_FORMAT = 1
+PACK_SUFFIX = ".llpack"
+MANIFEST = "manifest.json"
+PIVOT_LANGUAGE = "en"
+
+# zip local file header: signature, version, flags, method, time, date, crc, sizes, name length, extra length
+LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+ALIGN_EXTRA_ID = 0xd935		# same padding field as Android's zipalign
+
+
+class Pack:
+	"""A pack archive, opened on first access."""
+	def __init__(self, path: str):
+		self.path = path
+		self._zip = None
+
+	@property
+	def zip(self) -> zipfile.ZipFile:
+		if self._zip is None:
+			self._zip = zipfile.ZipFile(self.path)
+		return self._zip
+
+	@property
+	def manifest(self) -> dict:
+		return json.loads(self.zip.read(MANIFEST))
+
+	def has(self, name: str) -> bool:
+		return name in self.zip.NameToInfo
+
+	def read(self, name: str) -> bytes:
+		return self.zip.read(name)
+
+	def offset(self, name: str) -> int | None:
+		"""Offset of a stored (uncompressed) member's data in the archive, None if compressed."""
+		info = self.zip.getinfo(name)
+		if info.compress_type != zipfile.ZIP_STORED:
+			return None
+		with open(self.path, "rb") as f:
+			f.seek(info.header_offset)
+			header = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+		return info.header_offset + LOCAL_HEADER.size + header[-2] + header[-1]
+
+	def extract(self, name: str, path: str):
+		"""Copy a member to `path`, atomically."""
+		directory = os.path.dirname(path)
+		os.makedirs(directory, exist_ok=True)
+		fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as f, self.zip.open(name) as member:
+				shutil.copyfileobj(member, f, 1 << 20)
+			os.replace(tmp, path)
+		except BaseException:
+			os.unlink(tmp)
+			raise
+
+
+_packs = {"list": None}
+
+
+def packs() -> list[Pack]:
+	"""Installed packs, per-user first; the directories are listed once per process."""
+	if _packs["list"] is None:
+		_packs["list"] = [
+			Pack(os.path.join(directory, f))
+			for directory in (user_path("packs"), shared_path("packs")) if os.path.isdir(directory)
+			for f in sorted(os.listdir(directory)) if f.endswith(PACK_SUFFIX)
+		]
+	return _packs["list"]
+
+
+def find_member(*parts: str) -> tuple[Pack, str] | None:
+	name = "/".join(parts)
+	for pack in packs():
+		if pack.has(name):
+			return pack, name
+	return None
+
+
+def pack_json(*name: str) -> dict:
+	"""Merged content of the JSON cache `name` in every pack, earlier packs taking precedence."""
+	data = {}
+	member = "/".join(name) + ".json"
+	for pack in reversed(packs()):
+		if pack.has(member):
+			data.update(json.loads(pack.read(member)))
+	return data
+
+
+def pack_stamp(*name: str) -> list:
+	member = "/".join(name) + ".json"
+	return [os.path.getmtime(pack.path) for pack in packs() if pack.has(member)]
+
+
+def extract(*parts: str) -> str | None:
+	"""Path of a cache file, extracted from a pack into the user cache if it is only there."""
+	path = user_path(*parts)
+	if os.path.exists(path):
+		return path
+	found = find_member(*parts)
+	if found is None:
+		return None
+	with locked(path):
+		if not os.path.exists(path):
+			found[0].extract(found[1], path)
+	return path
+
+
+def extract_argos(from_code: str, to_code: str) -> str | None:
+	"""Extract the packed Argos models that translate `from_code` to `to_code`: the direct one
+	and the two hops through the pivot language; return the directory holding them, None if
+	no pack has one.
+	"""
+	wanted = {(from_code, to_code), (from_code, PIVOT_LANGUAGE), (PIVOT_LANGUAGE, to_code)}
+	directory = user_path("argos-packages")
+	extracted = False
+	for pack in packs():
+		for model in pack.manifest.get("argos", []):
+			if (model["from"], model["to"]) not in wanted:
+				continue
+			prefix = f"argos-packages/{model['dir']}/"
+			target = os.path.join(directory, model["dir"])
+			with locked(target):
+				if not os.path.exists(os.path.join(target, "metadata.json")):
+					# metadata.json last: Argos only sees the package once it is complete
+					names = sorted((n for n in pack.zip.namelist() if n.startswith(prefix) and not n.endswith("/")), key=lambda n: n.endswith("/metadata.json"))
+					for name in names:
+						pack.extract(name, os.path.join(target, *name[len(prefix):].split("/")))
+			extracted = True
+	return directory if extracted else None
+
+
+class _PackWriter:
+	def __init__(self, path: str):
+		self.zip = zipfile.ZipFile(path, "w")
+		self.count = 0
+
+	def add(self, name: str, data: bytes, align: bool = False):
+		info = zipfile.ZipInfo(name, time.localtime()[:6])
+		info.compress_type = zipfile.ZIP_DEFLATED if name.endswith(".json") else zipfile.ZIP_STORED
+		if align:
+			# Pad the local header so the data starts on 4 bytes, for the column offsets
+			start = self.zip.fp.tell() + LOCAL_HEADER.size + len(name.encode("utf-8")) + 4
+			info.extra = struct.pack("<HH", ALIGN_EXTRA_ID, -start % 4) + bytes(-start % 4)
+		self.zip.writestr(info, data)
+		self.count += 1
+
+	def add_file(self, name: str, path: str, align: bool = False):
+		with open(path, "rb") as f:
+			self.add(name, f.read(), align)
+
+	def add_tree(self, name: str, directory: str):
+		for root, _, files in os.walk(directory):
+			for f in sorted(files):
+				path = os.path.join(root, f)
+				self.add_file(name + "/" + os.path.relpath(path, directory).replace(os.sep, "/"), path)
+
+
+def _argos_models(langs: set[str]) -> list:
+	try:
+		import argostranslate.package
+	except ImportError:
+		print("Warning: argostranslate not installed, no translation model packed", file=sys.stderr)
+		return []
+	return [
+		p for p in argostranslate.package.get_installed_packages()
+		if {p.from_code, p.to_code} <= langs | {PIVOT_LANGUAGE} and ({p.from_code, p.to_code} & langs)
+	]
+
+
+def export_pack(path: str, langs: list[str]):
+	"""Pack the cached data, wordlists and translation models of `langs` into `path`."""
+	from .cache import JsonCache
+	from .examples import example_index
+	from .fuzzy import fuzzy_index
+	from .wordlist import column
+
+	langs = list(dict.fromkeys(langs))
+	dictionary_langs = set(langs) | {PIVOT_LANGUAGE}
+	models = _argos_models(set(langs))
+
+	directory = os.path.dirname(os.path.abspath(path))
+	fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+	os.close(fd)
+	try:
+		writer = _PackWriter(tmp)
+		writer.add(MANIFEST, json.dumps({
+			"format": PACK_FORMAT,
+			"created": round(time.time()),
+			"languages": langs,
+			"argos": [{"dir": p.package_path.name, "from": p.from_code, "to": p.to_code, "version": p.package_version} for p in models],
+		}).encode("utf-8"))
+
+		caches = [("wordreference", "dicts")]
+		caches += [("wordreference", a + b) for a in dictionary_langs for b in dictionary_langs if a != b and (a in langs or b in langs)]
+		caches += [("reverso", lang) for lang in langs]
+		for name in caches:
+			data = dict(JsonCache(*name).items())
+			if data:
+				writer.add("/".join(name) + ".json", json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+		for lang in langs:
+			try:
+				words = column(lang)
+				fuzzy_index(lang)
+			except FileNotFoundError:
+				print(f"Warning: no wordlist for '{lang}'", file=sys.stderr)
+				continue
+			writer.add(f"wordlist/{lang}.col", words.data(), align=True)
+			for suffix in (".keys.col", ".forms.col", ".idx"):
+				writer.add_file(f"fuzzy/{lang}{suffix}", user_path("fuzzy", lang + suffix), align=True)
+			# The stamp fuzzy_index expects for a column that does not come from a frequency list
+			writer.add(f"fuzzy/{lang}.json", json.dumps({"rows": len(words), "source": None}).encode("utf-8"))
+
+		for a in langs:
+			for b in langs:
+				if a != b and os.path.exists(user_path("examples", a + b + ".db")):
+					# Through SQLite, so sentences still in the write-ahead log are included
+					snapshot = tmp + ".db"
+					with closing(example_index(a, b).connect()) as source, closing(sqlite3.connect(snapshot)) as copy:
+						source.backup(copy)
+					writer.add_file(f"examples/{a}{b}.db", snapshot)
+					os.remove(snapshot)
+
+		for p in models:
+			writer.add_tree(f"argos-packages/{p.package_path.name}", str(p.package_path))
+		writer.zip.close()
+		os.replace(tmp, path)
+	except BaseException:
+		os.unlink(tmp)
+		raise
+	print(f"{writer.count} files, {os.path.getsize(path) / 1e6:.1f} MB packed into '{path}' ({', '.join(langs)})")
+
+
+def import_pack(path: str):
+	"""Install a pack for this user: one file copy, its content is read when first needed."""
+	try:
+		with zipfile.ZipFile(path) as z:
+			manifest = json.loads(z.read(MANIFEST))
+	except FileNotFoundError:
+		print(f"Error: '{path}' not found.", file=sys.stderr)
+		sys.exit(1)
+	except (zipfile.BadZipFile, KeyError, json.JSONDecodeError):
+		print(f"Error: '{path}' is not a language pack.", file=sys.stderr)
+		sys.exit(1)
+	if manifest.get("format") != PACK_FORMAT:
+		print(f"Error: '{path}' is a format {manifest.get('format')} pack, format {PACK_FORMAT} expected.", file=sys.stderr)
+		sys.exit(1)
+
+	name = os.path.basename(path)
+	if not name.endswith(PACK_SUFFIX):
+		name += PACK_SUFFIX
+	target = user_path("packs", name)
+	os.makedirs(os.path.dirname(target), exist_ok=True)
+	fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=name + ".", suffix=".tmp")
+	os.close(fd)
+	shutil.copyfile(path, tmp)
+	os.replace(tmp, target)
+	_packs["list"] = None
+	print(f"Pack '{name}' installed ({', '.join(manifest['languages'])}, {len(manifest['argos'])} translation models)")
@@ -0,0 +1,349 @@
+#!/usr/bin/python3
+################################################################################
+# @file      pages.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Cached web pages (Reverso, WordReference), kept fresh with conditional requests.
+# 
+# A page is cached parsed, in a JsonCache, and the HTTP validators it came
+# with (ETag, Last-Modified) are kept next to it, with the time it was last
+# checked:
+# 
+#   ~/.cache/language-learning/<source>/<name>.json        {key: parsed page}
+#   ~/.cache/language-learning/<source>/<name>.http.json   {key: {"etag", "last_modified", "checked", "failures", "retry"}}
+# 
+# (plus their `.log`, the entries not yet folded into the JSON files, see JsonCache)
+# 
+# Cached pages are always served from the cache. Once a page is older than
+# REFRESH_AFTER (plus a per-key jitter, so pages fetched together do not all
+# expire together) it is due: a 304 answer only renews the check time, only a
+# changed page is downloaded and parsed again. Long-lived processes (the
+# shell, the API, see `set_background_refresh`) revalidate the due pages they
+# serve in the background; one-shot commands leave them to `refresh_pages`
+# (--refresh), which finds every due page of the cache and revalidates it,
+# spaced by a random pause, so they never wait for a revalidation to exit.
+# A failed revalidation is retried RETRY_AFTER later, twice as late after each
+# failure in a row (up to REFRESH_AFTER), so pages of a language pack on an
+# offline host are not checked again on every run.
+# 
+# Identical requests are made once: concurrent callers in the process wait for
+# the first one's result, other processes for its lock file
+# (`locks/<source>/<name>/<key hash>.lock`, one per key, so unrelated pages
+# are fetched in parallel, and removed once released), then read the page it
+# cached.
+# 
+# Commands run within `deadline()` bound the wait for a page that is not
+# cached to their latency budget (--deadline, LOOKUP_DEADLINE): past it,
+# DeadlineExceeded lets the caller answer from local sources (as when the
+# source cannot be reached, see NO_ANSWER), while the
+# request carries on in a worker thread and caches the page when it arrives
+# (the process waits for it before exiting, REQUEST_TIMEOUT at most).
+
+import os, sys, re
+import contextvars
+import random
+import threading
+import time
+import zlib
+import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .cache import JsonCache
+from .fetch import fetch_conditional
+from .storage import user_path, locked_once
+
+
+REFRESH_AFTER = 30 * 86400	# seconds a cached page is trusted
+REFRESH_JITTER = 0.5		# a page is due between REFRESH_AFTER and REFRESH_AFTER * (1 + REFRESH_JITTER)
+REFRESH_PAUSE = 1.0			# mean seconds between two requests of a refresh
+RETRY_AFTER = 3600			# seconds before a page whose revalidation failed is due again
+LATE_WORKERS = 8			# requests carrying on past their deadline at the same time
+
+DURATION = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*(ms|s)?\s*$")
+
+
+class DeadlineExceeded(TimeoutError):
+	"""The page is not cached and its source did not answer within the deadline.
+	It is still being fetched, and cached when it arrives.
+	"""
+
+
+# A source that did not answer: in time, or at all (offline, refused, error status)
+NO_ANSWER = (DeadlineExceeded, requests.RequestException)
+
+
+def parse_duration(text: str) -> float:
+	"""Seconds of "800ms", "2s" or "1.5" (seconds)."""
+	match = DURATION.match(text)
+	if match is None:
+		raise ValueError(f"Invalid duration '{text}' (e.g. 800ms, 2s)")
+	return float(match[1]) / (1000 if match[2] == "ms" else 1)
+
+
+_deadline = {"budget": None}
+# When the current command's budget runs out: per thread and asyncio task, so concurrent
+# commands (API callers, shell prefetches) each keep their own. Work handed to a pool
+# carries it with `contextvars.copy_context().run`.
+_deadline_at = contextvars.ContextVar("deadline_at", default=None)
+
+
+def set_deadline(seconds: float | None = None):
+	"""Latency budget of a lookup command: `seconds`, else LOOKUP_DEADLINE from .env, else none."""
+	if seconds is None and os.getenv("LOOKUP_DEADLINE"):
+		try:
+			seconds = parse_duration(os.getenv("LOOKUP_DEADLINE"))
+		except ValueError as e:
+			print(f"Error: LOOKUP_DEADLINE: {e}", file=sys.stderr)
+	_deadline["budget"] = seconds
+
+
+@contextmanager
+def deadline(budget: float | None = None):
+	"""Bound the page downloads made within to `budget` seconds (default: the latency budget)
+	from now. Nested commands (a conjugation looking up the verb's translation) share the
+	outer budget.
+	"""
+	if budget is None:
+		budget = _deadline["budget"]
+	if budget is None or _deadline_at.get() is not None:
+		yield
+		return
+	token = _deadline_at.set(time.monotonic() + budget)
+	try:
+		yield
+	finally:
+		_deadline_at.reset(token)
+
+
+def remaining() -> float | None:
+	"""Seconds left to the current command, None when it has no deadline."""
+	at = _deadline_at.get()
+	return None if at is None else at - time.monotonic()
+
+
+class PageCache:
+	"""Parsed pages of one source, `url(key)` parsed by `parse(html, key)` (None: no such entry,
+	cached as well). `stored(key, data)` is called with every newly parsed page.
+	"""
+	def __init__(self, name: tuple, url, parse, stored=None):
+		self.name = name
+		self.entries = JsonCache(*name)
+		self.validators = JsonCache(*name[:-1], name[-1] + ".http")
+		self.url = url
+		self.parse = parse
+		self.stored = stored
+
+	def _download(self, key: str, validators: dict | None = None) -> bool:
+		"""(Re)validate `key`; return whether the page was downloaded, False on 304."""
+		html, received = fetch_conditional(self.url(key), validators)
+		received["checked"] = round(time.time())
+		if html is None:
+			self.validators.set(key, received)
+			return False
+		data = self.parse(html, key)
+		if key not in self.entries or self.entries.get(key) != data:
+			self.entries.set(key, data)
+		self.validators.set(key, received)
+		if data is not None and self.stored is not None:
+			self.stored(key, data)
+		return True
+
+	def checked(self, key: str) -> float:
+		validators = self.validators.get(key)
+		if validators is not None:
+			return validators["checked"]
+		# Cached before validators were kept, or provisioned: as old as the newest cache file
+		return max((t for t in self.entries.stamp() if t), default=0.0)
+
+	def due(self, key: str, now: float | None = None) -> bool:
+		now = now or time.time()
+		validators = self.validators.get(key)
+		if validators is not None and now < validators.get("retry", 0):
+			return False
+		jitter = (zlib.crc32(key.encode("utf-8")) & 0xffff) / 0xffff * REFRESH_JITTER
+		return now - self.checked(key) > REFRESH_AFTER * (1 + jitter)
+
+	def _failed(self, key: str):
+		"""Back off `key` after a failed revalidation; the next successful one clears it."""
+		validators = dict(self.validators.get(key) or {"checked": self.checked(key)})
+		failures = validators.get("failures", 0) + 1
+		validators.update(failures=failures, retry=round(time.time() + min(RETRY_AFTER * 2 ** (failures - 1), REFRESH_AFTER)))
+		self.validators.set(key, validators)
+
+	def _lock_path(self, key: str) -> str:
+		return user_path("locks", *self.name, f"{zlib.crc32(key.encode('utf-8')):08x}")
+
+	def _single_flight(self, key: str, work):
+		"""Run `work()` once for all the callers asking for `key` at the same time: threads of
+		this process wait for the first one's result, other processes for its lock.
+		"""
+		with _inflight_lock:
+			future = _inflight.get((self.name, key))
+			leader = future is None
+			if leader:
+				future = _inflight[self.name, key] = Future()
+		if not leader:
+			return future.result()
+		try:
+			with locked_once(self._lock_path(key)):
+				future.set_result(work())
+		except BaseException as e:
+			future.set_exception(e)
+		finally:
+			with _inflight_lock:
+				del _inflight[self.name, key]
+		return future.result()
+
+	def _fetch(self, key: str):
+		# Another process may have fetched it while we waited for the lock
+		self.entries.reload()
+		if key not in self.entries:
+			self._download(key)
+		return self.entries.get(key)
+
+	def _revalidate(self, key: str) -> bool:
+		self.validators.reload()
+		if not self.due(key):
+			# Revalidated meanwhile, by another caller
+			return False
+		try:
+			return self._download(key, self.validators.get(key))
+		except requests.RequestException:
+			self._failed(key)
+			raise
+
+	def get(self, key: str):
+		"""Cached page of `key`, downloaded if missing; a due page is revalidated in the background
+		of a long-lived process. Raise DeadlineExceeded when the download outlasts the current
+		command's deadline.
+		"""
+		if key in self.entries:
+			if _refresh["background"] and self.due(key):
+				_schedule(self, key)
+			return self.entries.get(key)
+		budget = remaining()
+		if budget is None:
+			return self._single_flight(key, lambda: self._fetch(key))
+		future = _late_executor().submit(contextvars.copy_context().run, self._single_flight, key, lambda: self._fetch(key))
+		try:
+			return future.result(timeout=max(budget, 0))
+		except TimeoutError:
+			raise DeadlineExceeded(f"No answer from {self.url(key)} within the deadline") from None
+
+	def revalidate(self, key: str) -> bool:
+		"""Revalidate `key` if it is still due; return whether the page was downloaded."""
+		return self._single_flight(key, lambda: self._revalidate(key))
+
+
+# Requests in flight in this process, by (cache name, key)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+# Downloads made under a deadline, in non-daemon threads: a late page is still cached
+_late = {"executor": None}
+_late_lock = threading.Lock()
+
+
+def _late_executor() -> ThreadPoolExecutor:
+	with _late_lock:
+		if _late["executor"] is None:
+			_late["executor"] = ThreadPoolExecutor(max_workers=LATE_WORKERS)
+		return _late["executor"]
+
+
+# One worker, in long-lived processes only: a one-shot command would wait for it to exit
+_refresh = {"background": False, "executor": None, "pending": set(), "last": 0.0}
+_refresh_lock = threading.Lock()
+
+
+def set_background_refresh(enabled: bool = True):
+	"""Revalidate the due pages served by this process in the background (shell, API)."""
+	_refresh["background"] = enabled
+
+
+def _revalidate_later(pages: PageCache, key: str):
+	# Spread the requests instead of sending them in a burst
+	pause = _refresh["last"] + random.uniform(0, 2 * REFRESH_PAUSE) - time.monotonic()
+	if pause > 0:
+		time.sleep(pause)
+	try:
+		pages.revalidate(key)
+	except Exception:
+		pass
+	finally:
+		_refresh["last"] = time.monotonic()
+		with _refresh_lock:
+			_refresh["pending"].discard((pages.name, key))
+
+
+def _schedule(pages: PageCache, key: str):
+	with _refresh_lock:
+		if (pages.name, key) in _refresh["pending"]:
+			return
+		if _refresh["executor"] is None:
+			_refresh["executor"] = ThreadPoolExecutor(max_workers=1)
+		_refresh["pending"].add((pages.name, key))
+		_refresh["executor"].submit(_revalidate_later, pages, key)
+
+
+def refresh_pages(caches: list[PageCache], limit: int | None = None):
+	"""Revalidate the due pages of `caches` now, oldest first, `limit` at most."""
+	now = time.time()
+	due = sorted(
+		(pages.checked(key), i, key)
+		for i, pages in enumerate(caches)
+		for key, _ in pages.entries.items() if pages.due(key, now)
+	)[:limit]
+	print(f"{len(due)} cached pages to revalidate")
+	renewed = updated = failed = 0
+	for n, (_, i, key) in enumerate(due):
+		if n:
+			time.sleep(random.uniform(0, 2 * REFRESH_PAUSE))
+		try:
+			if caches[i].revalidate(key):
+				updated += 1
+			else:
+				renewed += 1
+		except requests.RequestException as e:
+			failed += 1
+			print(f"Error: '{key}': {e}", file=sys.stderr)
+		print(f"\r{n + 1}/{len(due)}: {renewed} not modified, {updated} downloaded, {failed} failed", end="", flush=True)
+	if due:
+		print()
+
+
+def cached_names(source: str) -> list[str]:
+	"""Names of the page caches of `source` on disk ("es" for reverso/es.json)."""
+	directory = user_path(source)
+	if not os.path.isdir(directory):
+		return []
+	return sorted({
+		f.rsplit(".", 1)[0] for f in os.listdir(directory)
+		if f.endswith((".json", ".log")) and not f.endswith((".http.json", ".http.log"))
+	})
+
+
+def refresh_cached(limit: int | None = None):
+	"""Revalidate the due Reverso and WordReference pages of the user cache."""
+	from .conjugation import _conjugation_cache
+	from .translate import _translation_cache
+
+	refresh_pages(
+		[_conjugation_cache(name) for name in cached_names("reverso")]
+		# Dictionary pairs ("fres"), not the list of dictionaries
+		+ [_translation_cache(name[:2], name[2:]) for name in cached_names("wordreference") if len(name) == 4],
+		limit,
+	)
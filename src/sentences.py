@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+################################################################################
+# @file      sentences.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Rule-based sentence splitter, used by Argos in place of its model-based one.
+# 
+# A sentence ends at `.`, `!`, `?` or `…` (plus the Devanagari dandas and the
+# Arabic-script `؟` and `۔`, and closing quotes/brackets) followed by
+# whitespace and a capital, a digit or an opening quote/`¿`/`¡` (any letter in
+# scripts without case: Arabic, Hebrew, Devanagari...), unless the word before
+# the period is an abbreviation of the language or an initial. CJK full stops
+# end a sentence without any space after them.
+# 
+# Languages written without spaces or stops between sentences (UNCOVERED)
+# keep Argos' model-based splitter.
+
+import re
+from functools import cache
+
+
+# Lowercase, without the final period; keyed like `short_names`
+ABBREVIATIONS = {
+	"en": {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs", "etc", "e.g", "i.e", "approx", "dept", "est", "fig", "inc", "ltd", "co", "corp", "no", "vol", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k", "a.m", "p.m"},
+	"fr": {"m", "mm", "mme", "mmes", "mlle", "mlles", "dr", "pr", "me", "st", "ste", "etc", "cf", "p.ex", "env", "av", "bd", "fig", "vol", "n°", "no", "janv", "févr", "avr", "juil", "sept", "oct", "nov", "déc", "c.-à-d"},
+	"es": {"sr", "sra", "srta", "sres", "dr", "dra", "d", "dña", "ud", "uds", "vd", "vds", "prof", "lic", "ing", "etc", "p.ej", "pág", "págs", "núm", "av", "avda", "c", "cía", "ene", "feb", "mar", "abr", "jun", "jul", "ago", "sept", "oct", "nov", "dic", "ee.uu", "a.c", "d.c"},
+	"de": {"hr", "fr", "dr", "prof", "str", "nr", "bzw", "ca", "usw", "vgl", "z.b", "d.h", "u.a", "s", "evtl", "ggf", "inkl", "jan", "feb", "mär", "apr", "jun", "jul", "aug", "sep", "okt", "nov", "dez"},
+	"it": {"sig", "sigg", "sig.ra", "sig.na", "dott", "dott.ssa", "prof", "ing", "avv", "ecc", "es", "pag", "pagg", "n", "vol", "gen", "feb", "mar", "apr", "mag", "giu", "lug", "ago", "set", "ott", "nov", "dic"},
+	"pt": {"sr", "sra", "srta", "dr", "dra", "prof", "profa", "eng", "etc", "ex", "pág", "n", "nº", "av", "jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"},
+	"ru": {"г", "гг", "ул", "д", "т.е", "т.д", "т.п", "т.к", "др", "пр", "см", "им", "проф", "акад", "стр", "руб", "коп", "тыс", "млн", "млрд"},
+}
+
+# Thai, Lao, Khmer, Burmese, Tibetan
+UNCOVERED = {"th", "lo", "km", "my", "bo"}
+
+_BOUNDARY = re.compile(r"""([.!?…।॥؟۔]+(?:\s?[»”]|['"’)\]])*)\s+(?=['"«“‘(\[¿¡]*(\w))""")
+_CJK_BOUNDARY = re.compile(r"([。！？]+[」』”）]*)")
+_WORD_BEFORE = re.compile(r"(\S+)$")
+
+
+class RuleSentencizer:
+	"""Drop-in replacement of Argos' sentence boundary detection (`split_sentences`)."""
+	def __init__(self, lang: str):
+		self.lang = lang
+		self.abbreviations = ABBREVIATIONS.get(lang, set())
+
+	def _is_abbreviation(self, before: str) -> bool:
+		match = _WORD_BEFORE.search(before)
+		if match is None:
+			return False
+		word = match.group(1).lstrip("([\"'«“‘¿¡").lower()
+		# Initials ("J. R. R. Tolkien") and listed abbreviations, "e.g." included
+		return (len(word) == 1 and word.isalpha()) or word in self.abbreviations
+
+	def split_sentences(self, text: str) -> list[str]:
+		sentences = []
+		start = 0
+		for match in _BOUNDARY.finditer(text):
+			following = match.group(2)
+			caseless = following.isalpha() and following.lower() == following.upper()
+			if not (following.isupper() or following.isdigit() or caseless):
+				continue
+			if match.group(1) == "." and self._is_abbreviation(text[start:match.start()]):
+				continue
+			sentences.append(text[start:match.end(1)])
+			start = match.end()
+		sentences.append(text[start:])
+
+		result = []
+		for sentence in sentences:
+			parts = _CJK_BOUNDARY.split(sentence)
+			# Re-attach each full stop to the text before it
+			result.extend(p + d for p, d in zip(parts[::2], parts[1::2] + [""]))
+		return [s.strip() for s in result if s.strip()]
+
+	def __str__(self):
+		return "RuleSentencizer"
+
+
+@cache
+def sentencizer(lang: str) -> RuleSentencizer:
+	return RuleSentencizer(lang)
+
+
+def covers(lang: str) -> bool:
+	"""Whether the rules can split `lang`'s sentences."""
+	return lang not in UNCOVERED
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+################################################################################
+# @file      shell.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+import os, sys
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from prompt_toolkit import PromptSession
+from prompt_toolkit.completion import WordCompleter
+from prompt_toolkit.history import FileHistory
+
+from .storage import PATH_CACHE
+from .compare import conjugation_comparison
+from .conjugation import conjugation_table, fetch_conjugation, ConjugationError
+from .pages import set_background_refresh
+from .train import train_vocabulary
+from .train_conjugation import train_conjugation
+from .translate import translate_word, lookup_word, first_meaning, available_dicts
+from .translate_text import translate_text
+
+
+COMMANDS = {
+	"w":     "w WORD          Translate word",
+	"c":     "c [VERB...]     Conjugate verb (in TO language), side by side if several",
+	"t":     "t TEXT          Translate text",
+	"pair":  "pair FROM TO    Switch language pair",
+	"swap":  "swap            Swap FROM and TO",
+	"train": "train           Train vocabulary for the current pair",
+	"drill": "drill           Drill conjugations of the verbs looked up so far",
+	"help":  "help            Show this help",
+	"quit":  "quit            Leave (or Ctrl-D)",
+}
+
+
+def _is_verb(data: dict) -> bool:
+	for translation in data["translations"][:1]:
+		for entry in translation["entries"][:1]:
+			return (entry["from_word"]["grammar"] or "").startswith("v")
+	return False
+
+
+def _prefetch_conjugation(_from: str, _to: str, verb: str):
+	"""Warm everything `conjugation_table(_from, _to, verb)` will need."""
+	fetch_conjugation(_to, verb)
+	verb_from = first_meaning(lookup_word(_to, _from, verb))
+	if verb_from:
+		fetch_conjugation(_from, verb_from)
+
+
+def _prefetch_after_word(_from: str, _to: str, word: str):
+	"""A looked up verb is usually conjugated next: fetch both conjugation tables ahead."""
+	data = lookup_word(_from, _to, word)
+	if _is_verb(data):
+		verb = first_meaning(data)
+		if verb:
+			_prefetch_conjugation(_from, _to, verb)
+
+
+def lookup_shell(_from: str, _to: str):
+	"""Interactive lookups within one process: dictionaries, HTTP session, Argos models
+	and caches stay loaded between commands.
+	"""
+	os.makedirs(PATH_CACHE, exist_ok=True)
+	set_background_refresh()
+	session = PromptSession(
+		history=FileHistory(os.path.join(PATH_CACHE, "shell_history")),
+		completer=WordCompleter(list(COMMANDS), sentence=True),
+	)
+	prefetch = ThreadPoolExecutor(max_workers=2)
+
+	def background(fn, *args):
+		def run():
+			try:
+				fn(*args)
+			except Exception:
+				pass
+		# The prefetch runs in the context it was asked from, never under a later command's deadline
+		prefetch.submit(contextvars.copy_context().run, run)
+
+	print("\n".join(COMMANDS.values()))
+	background(available_dicts)
+
+	while True:
+		try:
+			line = session.prompt(f"{_from} > {_to}: ").strip()
+		except KeyboardInterrupt:
+			continue
+		except EOFError:
+			break
+		if not line:
+			continue
+
+		command, _, arg = line.partition(" ")
+		arg = arg.strip()
+		try:
+			if command in ("quit", "exit", "q"):
+				break
+
+			elif command == "help":
+				print("\n".join(COMMANDS.values()))
+
+			elif command == "pair":
+				codes = arg.lower().split()
+				if len(codes) != 2 or codes[0] == codes[1]:
+					print("Usage: pair FROM TO (two different languages)", file=sys.stderr)
+					continue
+				_from, _to = codes
+
+			elif command == "swap":
+				_from, _to = _to, _from
+
+			elif command == "w" and arg:
+				translate_word(_from, _to, arg)
+				background(_prefetch_after_word, _from, _to, arg)
+
+			elif command == "c" and len(arg.split()) > 1:
+				conjugation_comparison([_to, _from], arg.split())
+
+			elif command == "c":
+				conjugation_table(_from, _to, arg or None)
+
+			elif command == "t" and arg:
+				translate_text(_from, _to, arg)
+
+			elif command == "train":
+				train_vocabulary(_from, _to)
+
+			elif command == "drill":
+				train_conjugation(_from, _to)
+
+			else:
+				print(f"Unknown command '{line}', type 'help'", file=sys.stderr)
+
+		except ConjugationError as e:
+			print(f"Error: {e}", file=sys.stderr)
+		except SystemExit:
+			# The shell keeps going after a command gave up
+			pass
+		except KeyboardInterrupt:
+			print()
+		except Exception as e:
+			# Network failures, unavailable pairs...: only this command is lost, not the warm caches
+			print(f"Error: {e}", file=sys.stderr)
+
+	prefetch.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+################################################################################
+# @file      storage.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Files under the cache directories, safe with several processes and users.
+# 
+# - writers take an advisory lock (`<file>.lock`) around read-modify-write
+# - files are replaced atomically: written to a temporary file, then renamed
+# - a read-only, system-wide cache (LANGUAGE_LEARNING_SHARED_CACHE, default
+#   /var/cache/language-learning) is layered under the per-user one, so warmed
+#   data can be provisioned once per host
+
+import os, json
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+	import fcntl
+except ImportError:		# Windows: no advisory locks, atomic renames still apply
+	fcntl = None
+
+
+PATH_CACHE = os.path.join(str(Path.home()), ".cache/language-learning")
+DEFAULT_SHARED_CACHE = "/var/cache/language-learning"
+
+
+def user_path(*parts: str) -> str:
+	return os.path.join(PATH_CACHE, *parts)
+
+
+def shared_path(*parts: str) -> str:
+	# Read at call time, so a value from .env (loaded after imports) is honoured
+	return os.path.join(os.getenv("LANGUAGE_LEARNING_SHARED_CACHE", DEFAULT_SHARED_CACHE), *parts)
+
+
+def find(*parts: str) -> str | None:
+	"""First existing copy of a cache file: per-user first, then system-wide."""
+	for path in (user_path(*parts), shared_path(*parts)):
+		if os.path.exists(path):
+			return path
+	return None
+
+
+@contextmanager
+def locked(path: str, shared: bool = False):
+	"""Hold the lock of `path`: shared for readers, exclusive for writers."""
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with open(path + ".lock", "a") as f:
+		if fcntl:
+			fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+		try:
+			yield
+		finally:
+			if fcntl:
+				fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked_once(path: str):
+	"""Exclusive lock of `path` whose lock file is removed on release, for locks taken once
+	per key (which would otherwise pile up).
+	"""
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	while True:
+		f = open(path + ".lock", "a")
+		if not fcntl:
+			break
+		fcntl.flock(f, fcntl.LOCK_EX)
+		# The previous holder may have removed the file while we waited for it: lock the current one
+		try:
+			if os.path.samestat(os.fstat(f.fileno()), os.stat(path + ".lock")):
+				break
+		except FileNotFoundError:
+			pass
+		f.close()
+	try:
+		yield
+	finally:
+		if fcntl:
+			# Removed while still held: a waiter on this file then finds it stale
+			os.unlink(path + ".lock")
+			fcntl.flock(f, fcntl.LOCK_UN)
+		f.close()
+
+
+def atomic_write(path: str, data: bytes | str):
+	"""Replace `path` with `data`; readers see either the old or the new file, never a partial one."""
+	directory = os.path.dirname(path)
+	os.makedirs(directory, exist_ok=True)
+	fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as f:
+			f.write(data.encode("utf-8") if isinstance(data, str) else data)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(tmp, path)
+	except BaseException:
+		os.unlink(tmp)
+		raise
+
+
+def read_json(path: str, default=None):
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			return json.load(f)
+	except (FileNotFoundError, json.JSONDecodeError):
+		return default
+
+
+def write_json(path: str, data):
+	atomic_write(path, json.dumps(data, ensure_ascii=False))
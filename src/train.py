@@ -14,12 +14,15 @@
 # 
 ################################################################################
 
-import os
-import re, random, math, json
-from pathlib import Path
-from unidecode import unidecode
+import re, random, math
+import queue, threading, time
+from functools import cache
 
 from .input import *
+from .journal import Journal, SKIPPED
+from .translate import lookup_word
+from .matcher import matcher, HINT_RATIO, CORRECT, TYPO, ALMOST
+from .wordlist import concepts
 
 
 MIN_COLOUR = 0x99
@@ -34,159 +37,264 @@ def str_to_shell_colour(s: str) -> str:
 		return "bold #00"+hex(MIN_COLOUR + (res % 7) * 0x11)[2:]+"00"
 	return "bold #0000"+hex(MIN_COLOUR + (res % 7) * 0x11)[2:]
 
-facultative_words = {
-	"fr": r"une?|le(ur)?s?|la|du|des",
-	"en": r"a|the(ir)?s?",
-	"es": r"el|los|las?|sus?",
-}
+@cache
+def load_wordlist(_from: str, _to: str) -> dict:
+	"""Aligned `{from_word: to_word}` for the pair, read from the concept matrix once per process."""
+	# Languages without articles in facultative_words are kept as is
+	strip_from, strip_to = matcher(_from).strip, matcher(_to).strip
+	wordlist = {strip_from(k).strip(): strip_to(v).strip() for k, v in concepts(_from, _to)}
+	return {
+		k: v
+		for k, v in wordlist.items()
+		if len(k) > 2 and len(v) > 2
+			# and k == "spanish" or k == "english" or k == "french" or k == "italian"
+	}
 
 PADDING = 16
-HINT_RATIO = 10.0
 ALMOST_RATIO = 15.0
 ALMOST_RETRY = True
 RETRY_FAILED = 5
+PREFETCH_CARDS = 8
 
-def train_vocabulary(_from: str, _to: str):
-	wordlist = {}
-	
-	never_failed = []
-	never_failed_all = {}
-	wordlist_failed = {}
 
-	path_cache = os.path.join(str(Path.home()), ".cache/language-learning")
-	never_failed_path = os.path.join(path_cache, "never_failed.json")
-	os.makedirs(path_cache, exist_ok=True)
+class Card:
+	"""Everything shown for one word, prepared ahead of its prompt."""
+	__slots__ = ("word", "target", "visible_slots", "note", "example")
 
-	try:
-		with open(never_failed_path, "r") as f:
-			never_failed_all = json.load(f)
-		# print(never_failed_all)
-		if (_from+_to) in never_failed_all:
-			never_failed = never_failed_all[_from+_to]
-	except FileNotFoundError:
-		pass
-
-	# print(never_failed)
-	with open(os.path.join(os.path.dirname(__file__), "most-common-words-multilingual/data/wordfrequency.info", _from+".txt"), "r") as ff:
-		with open(os.path.join(os.path.dirname(__file__), "most-common-words-multilingual/data/wordfrequency.info", _to+".txt"), "r") as ft:
-			wordlist = {
-				(re.sub(r"^("+ facultative_words[_from] +r")\s+", "", k) if k in facultative_words else k).strip():
-					(re.sub(r"^("+ facultative_words[_to] +r")\s+", "", v) if v in facultative_words else v).strip()
-				for k, v in dict(zip(ff.read().splitlines(), ft.read().splitlines())).items()
-			}
-			wordlist = {
-				k: v
-				for k, v in wordlist.items()
-				if len(k) > 2 and len(v) > 2 and k not in never_failed
-					# and k == "spanish" or k == "english" or k == "french" or k == "italian"
-			}
-
-	from_colour = str_to_shell_colour(_from)
-	to_colour = str_to_shell_colour(_to)
-
-	if from_colour == to_colour:
-		from_colour = "bold #000000"
-
-	def step_word():
-		nonlocal wordlist_failed
-		wordlist_failed = {k: (v - 1 if isinstance(v, (int, float)) else v) for k, v in wordlist_failed.items()}
-
-	def user_succeed(w: str):
-		nonlocal wordlist_failed
-		# never_failed.append(w)
-		wordlist.pop(w, None)
-		wordlist_failed.pop(w, None)
-
-	def user_failed(w: str):
-		nonlocal wordlist_failed
-		wordlist_failed[w] = RETRY_FAILED
+	def __init__(self, word: str, target, visible_slots: dict, note: str, example: str | None):
+		self.word = word
+		self.target = target
+		self.visible_slots = visible_slots
+		self.note = note
+		self.example = example
 
-	def choose_word() -> str:
-		return next((k for k, v in wordlist_failed.items() if v <= 0), random.choice(list(wordlist.keys())))
 
-	note = ""
+def hint_slots(lword: str, rng=random) -> dict:
+	"""Letters revealed from the start: separators, one letter per word, plus one every HINT_RATIO letters."""
+	visible_slots = {index: value for index, value in enumerate(lword) if value in ALWAYS_VISIBLE}
 
-	continue_training = True
-	while continue_training:
-		word = choose_word()
+	current_pos = 0  # tracks the letter index in the whole sentence
 
-		# if "'" not in word:
-		# 	continue
+	for w in re.split(r"|".join(ALWAYS_VISIBLE), lword):
+		letter_idx_in_word = rng.randrange(len(w))
+		global_idx = current_pos + letter_idx_in_word
+		visible_slots[global_idx] = w[letter_idx_in_word]
+		current_pos += len(w) + 1
 
-		lword = wordlist[word].strip().lower()
-		if _to in facultative_words:
-			lword = re.sub(r"^("+ facultative_words[_to] +r")\s+", "", lword).strip()
+	# print(len(lword))
+	if len(lword) >= HINT_RATIO:
+		remaining = math.floor(len(lword) / HINT_RATIO)
+		# print(HINT_RATIO, remaining)
 
-		visible_slots = {index: value for index, value in enumerate(lword) if value in ALWAYS_VISIBLE}
+		while remaining > 0:
+			global_idx = rng.randrange(len(lword))
+			if global_idx not in visible_slots:
+				visible_slots[global_idx] = lword[global_idx]
+				remaining -= 1
+	return visible_slots
 
-		current_pos = 0  # tracks the letter index in the whole sentence
 
-		for w in re.split(r"|".join(ALWAYS_VISIBLE), lword):
-			letter_idx_in_word = random.randrange(len(w))
-			global_idx = current_pos + letter_idx_in_word
-			visible_slots[global_idx] = w[letter_idx_in_word]
-			current_pos += len(w) + 1
-
-		# print(len(lword))
-		if len(lword) >= HINT_RATIO:
-			remaining = math.floor(len(lword) / HINT_RATIO)
-			# print(HINT_RATIO, remaining)
-
-			while remaining > 0:
-				global_idx = random.randrange(len(lword))
-				if global_idx not in visible_slots:
-					visible_slots[global_idx] = lword[global_idx]
-					remaining -= 1
+def example_sentence(_from: str, _to: str, word: str) -> str | None:
+	"""Source-language WordReference example for `word` (cached per pair), None if there is none."""
+	try:
+		data = lookup_word(_from, _to, word)
+	except Exception:
+		return None
+	return next((
+		entry["from_example"]
+		for translation in data["translations"]
+		for entry in translation["entries"]
+		if entry["from_example"]
+	), None)
+
+
+class CardPrefetcher(threading.Thread):
+	"""Prepares the next cards while the user is answering the current one."""
+	def __init__(self, pick_word, make_card, size: int = PREFETCH_CARDS):
+		super().__init__(daemon=True)
+		self.pick_word = pick_word
+		self.make_card = make_card
+		self.cards = queue.Queue(maxsize=size)
+		self.stopped = threading.Event()
+
+	def run(self):
+		while not self.stopped.is_set():
+			picked = self.pick_word()
+			if picked is None:
+				return
+			card = self.make_card(*picked, True)
+			while not self.stopped.is_set():
+				try:
+					self.cards.put(card, timeout=0.1)
+					break
+				except queue.Full:
+					pass
+
+	def next(self) -> Card | None:
+		try:
+			return self.cards.get_nowait()
+		except queue.Empty:
+			return None
+
+	def stop(self):
+		self.stopped.set()
+
+
+class Trainer:
+	"""Vocabulary training state of one learner: which word comes next, and what an answer is worth.
+	Prints nothing; `train_vocabulary` is its terminal front end.
+	"""
+	def __init__(self, _from: str, _to: str, examples: bool = False, journal: Journal | None = None, wordlist: dict | None = None, rng: random.Random | None = None, prefetch: bool = True):
+		"""`rng` draws the words and hints, `prefetch=False` makes every card on demand:
+		together, a seeded `rng` replays the same session.
+		"""
+		self._from, self._to = _from, _to
+		self.pair = _from + _to
+		self.examples = examples
+		self.journal = journal or Journal()
+		excluded = self.journal.excluded_words(self.pair)
+		if wordlist is None:
+			wordlist = load_wordlist(_from, _to)
+		self.wordlist = {k: v for k, v in wordlist.items() if k not in excluded}
+		self.failed = {}
+		self.matcher = matcher(_to)
+		self.targets = {k: self.matcher.target(v) for k, v in self.wordlist.items()}
+		self.rng = rng or random.Random()
+		self.lock = threading.Lock()
+		self.prefetcher = CardPrefetcher(self.pick_word, self.make_card) if prefetch else None
+		if self.prefetcher is not None:
+			self.prefetcher.start()
+
+	def pick_word(self) -> tuple[str, str] | None:
+		"""(word, its answer), read together: the word may be learnt before its card is made."""
+		with self.lock:
+			if not self.wordlist:
+				return None
+			word = self.rng.choice(list(self.wordlist.keys()))
+			return word, self.wordlist[word]
+
+	def make_card(self, word: str, answer: str, prefetching: bool = False) -> Card:
+		target = self.targets[word]
+		# Latin transcription of Cyrillic answers
+		note = transcript_latin(answer) if self._to.upper() in TRANSCRIPT_LAYOUT_COUNTRY_CODE else ""
+		# Network is only worth it in the background, never while the user waits
+		example = example_sentence(self._from, self._to, word) if self.examples and prefetching else None
+		return Card(word, target, hint_slots(target.lword, self.rng), note, example)
+
+	def next_card(self) -> Card | None:
+		"""Next card: a failed word whose turn has come back, else a prefetched one. None when all words are learnt."""
+		due = next((k for k, v in self.failed.items() if v <= 0), None)
+		if due is not None:
+			return self.make_card(due, self.wordlist[due])
+		while self.prefetcher is not None and (card := self.prefetcher.next()) is not None:
+			if card.word in self.wordlist:
+				return card
+		picked = self.pick_word()
+		return None if picked is None else self.make_card(*picked)
+
+	def expected(self, card: Card) -> str:
+		return self.wordlist[card.word]
+
+	def _succeed(self, word: str):
+		with self.lock:
+			self.wordlist.pop(word, None)
+		self.failed.pop(word, None)
+
+	def _fail(self, word: str):
+		self.failed[word] = RETRY_FAILED
+
+	def answer(self, card: Card, user_answer: str, latency: float = 0.0) -> str:
+		"""Grade and record an answer. ALMOST leaves the card pending, to be answered again."""
+		grade = self.matcher.grade(card.target, user_answer)
+		self.journal.record(self.pair, card.word, grade, latency)
+		if grade in (CORRECT, TYPO):
+			self._succeed(card.word)
+		elif grade != ALMOST:
+			self._fail(card.word)
+		return grade
+
+	def skip(self, card: Card, latency: float = 0.0):
+		self.journal.record(self.pair, card.word, SKIPPED, latency)
+		self._fail(card.word)
+
+	def step(self):
+		"""One card done: failed words come closer to being asked again."""
+		self.failed = {k: v - 1 for k, v in self.failed.items()}
+
+	def close(self):
+		if self.prefetcher is not None:
+			self.prefetcher.stop()
+		self.journal.close()
+
+
+def keyboard_answers(_from: str, _to: str):
+	"""Answer source of the terminal: the learner types the answer in a slot prompt.
+	An answer source takes a card and returns the answer, "" to skip, None to stop.
+	"""
+	from_colour = str_to_shell_colour(_from)
+	to_colour = str_to_shell_colour(_to)
 
-		if _to.upper() in TRANSCRIPT_LAYOUT_COUNTRY_CODE:
-			note = f" (\x1b[3m{transcript_latin(wordlist[word])}\x1b[0m)"
+	if from_colour == to_colour:
+		from_colour = "bold #000000"
 
-		retry = True
-		while continue_training and retry:
-			user_answer = None
-			try:
-				user_answer = slot_input(from_colour, to_colour, _from.upper(), _to.upper(), word.lower().ljust(PADDING, " "), len(lword), visible_slots)
-			except KeyboardInterrupt:
-				pass
+	def ask(card: Card) -> str | None:
+		return slot_input(from_colour, to_colour, _from.upper(), _to.upper(), card.word.lower().ljust(PADDING, " "), len(card.target.lword), card.visible_slots)
+	return ask
 
-			retry = False
-			if user_answer is None:
-				continue_training = False
 
-			elif not user_answer:
-				print(f"            {word:>{PADDING}s} = {wordlist[word]}{note}")
-				user_failed(word)
+def train_vocabulary(_from: str, _to: str, examples: bool = False, ask=None):
+	trainer = Trainer(_from, _to, examples)
+	ask = ask or keyboard_answers(_from, _to)
 
-			else:
-				luser = user_answer.lower()
+	try:
+		continue_training = True
+		while continue_training:
+			card = trainer.next_card()
+			if card is None:
+				break
+			word = card.word
+			note = f" (\x1b[3m{card.note}\x1b[0m)" if card.note else ""
+
+			if card.example:
+				print(f"\x1b[2;3m{card.example}\x1b[0m")
+
+			retry = True
+			while continue_training and retry:
+				user_answer = None
+				start = time.perf_counter()
+				try:
+					user_answer = ask(card)
+				except KeyboardInterrupt:
+					pass
+
+				latency = time.perf_counter() - start
+
+				retry = False
+				if user_answer is None:
+					continue_training = False
+
+				elif not user_answer:
+					print(f"            {word:>{PADDING}s} = {trainer.expected(card)}{note}")
+					trainer.skip(card, latency)
 
-				if _to in facultative_words:
-					lword = re.sub(r"^("+ facultative_words[_to] +r")\s+", "", lword)
-					luser = re.sub(r"^("+ facultative_words[_to] +r")\s+", "", luser)
+				else:
+					expected = trainer.expected(card)
+					grade = trainer.answer(card, user_answer, latency)
 
-				ulword = unidecode(lword)
-				uluser = unidecode(luser)
-				count = sum(1 for a, b in zip(ulword, luser) if a != b) + abs(len(ulword) - len(luser))
-				almost = 1 + (len(ulword) / HINT_RATIO)
+					if grade == CORRECT:
+						print(f"\x1b[1;32m\u2714 Correct !\x1b[0m")
 
-				if lword == re.sub(r"^(el|le|la|un(a|e)?|du) ", "", luser):
-					print(f"\x1b[1;32m\u2714 Correct !\x1b[0m")
-					user_succeed(word)
+					elif grade == TYPO:
+						print(f"\x1b[1;33m\u2714 Typo\x1b[0m      {word:>{PADDING}s} = {expected}{note}")
 
-				elif ulword == uluser:
-					print(f"\x1b[1;33m\u2714 Typo\x1b[0m      {word:>{PADDING}s} = {wordlist[word]}{note}")
-					user_succeed(word)
+					elif grade == ALMOST:
+						print(f"\x1b[1;33m  Almost!\x1b[0m")
+						retry = True
 
-				elif count <= almost:
-					print(f"\x1b[1;33m  Almost!\x1b[0m")
-					retry = True
+					else:
+						print(f"\x1b[1;31m\u2a2f Incorrect\x1b[0m {word:>{PADDING}s} = {expected}{note}")
+			trainer.step()
+			print()
 
-				else:
-					print(f"\x1b[1;31m\u2a2f Incorrect\x1b[0m {word:>{PADDING}s} = {wordlist[word]}{note}")
-					user_failed(word)
-		step_word()
-		print()
-
-	with open(never_failed_path, 'w') as f:
-		never_failed_all[_from+_to] = never_failed
-		json.dump(never_failed_all, f)
+	finally:
+		trainer.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+################################################################################
+# @file      train_conjugation.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Conjugation drill over the verbs already conjugated once (Reverso cache).
+# 
+# The cached tables are compiled into a question bank, one row per (verb,
+# tense, pronoun), with the matching form of the source-language verb when
+# both tables and a CONJUGATION_LINKS entry are cached. The bank is a column
+# (see wordlist.py), rebuilt when a cache changes, so a question is drawn with
+# one random index and the drill never touches the network:
+# 
+#   ~/.cache/language-learning/drill/<from><to>.col   "verb\ttense\tpronoun\texpected\tsource form" rows
+
+import os, sys
+import random
+import time
+from benedict import benedict
+
+from .cache import JsonCache
+from .compare import linked_tense, tense_rows, by_person
+from .input import slot_input
+from .journal import Journal, SKIPPED
+from .matcher import matcher, CORRECT, TYPO, ALMOST
+from .storage import PATH_CACHE, locked, read_json, write_json
+from .train import str_to_shell_colour, hint_slots, PADDING, RETRY_FAILED
+from .translate import first_meaning
+from .wordlist import Column, write_column_file
+
+
+DRILL_PATH = os.path.join(PATH_CACHE, "drill")
+
+
+class Question:
+	"""One row of the bank."""
+	__slots__ = ("verb", "tense", "pronoun", "expected", "source")
+
+	def __init__(self, row: str):
+		self.verb, self.tense, self.pronoun, self.expected, self.source = row.split("\t")
+
+	@property
+	def key(self) -> str:
+		return f"{self.verb}|{self.tense}|{self.pronoun}"
+
+
+def _questions(_from: str, _to: str, conjugations: JsonCache, sources: JsonCache, translations: JsonCache):
+	for verb, data in conjugations.items():
+		if not data:
+			continue
+		entry = translations.get(verb)
+		verb_from = first_meaning(entry) if entry else None
+		data_from = sources.get(verb_from.lower()) if verb_from else None
+		data_from = benedict(data_from) if data_from else None
+
+		for mood, tenses in data.items():
+			for tense, persons in tenses.items():
+				# Matched by person, not position: "il/elle/on" asked with "él/ella/usted"
+				source_rows = by_person(_from, tense_rows(data_from, linked_tense(_to, _from, f"{mood}.{tense}")))
+				title = mood if tense == mood else f"{mood} {tense}"
+				for person, (pronoun, form) in by_person(_to, list(persons.items())).items():
+					if form.strip():
+						source = " ".join(s.strip() for s in source_rows[person]).strip() if person in source_rows else ""
+						yield "\t".join((verb, title, pronoun.strip(), form.strip(), source))
+
+
+def question_bank(_from: str, _to: str) -> Column:
+	"""Bank of the pair, rebuilt when one of the caches it comes from has changed."""
+	path = os.path.join(DRILL_PATH, _from + _to + ".col")
+	caches = (JsonCache("reverso", _to), JsonCache("reverso", _from), JsonCache("wordreference", _to + _from))
+	stamp = [t for c in caches for t in c.stamp()]
+	if read_json(path + ".json") != stamp:
+		with locked(path):
+			if read_json(path + ".json") != stamp:
+				write_column_file(path, list(_questions(_from, _to, *caches)))
+				write_json(path + ".json", stamp)
+	return Column(path)
+
+
+def train_conjugation(_from: str, _to: str):
+	bank = question_bank(_from, _to)
+	if not len(bank):
+		print(f"Error: No conjugation cached for '{_to}', conjugate some verbs first (-c VERB).", file=sys.stderr)
+		return
+	print(f"{len(bank)} questions, {len({Question(row).verb for row in bank})} verbs\n")
+
+	journal = Journal()
+	pair = f"{_from}{_to}-conjugation"
+	answer_matcher = matcher(_to)
+	failed = {}
+
+	from_colour = str_to_shell_colour(_from)
+	to_colour = str_to_shell_colour(_to)
+	if from_colour == to_colour:
+		from_colour = "bold #000000"
+
+	def next_question() -> Question:
+		due = next((k for k, (count, _) in failed.items() if count <= 0), None)
+		if due is not None:
+			return failed.pop(due)[1]
+		return Question(bank[random.randrange(len(bank))])
+
+	try:
+		while True:
+			question = next_question()
+			target = answer_matcher.target(question.expected)
+			print(f"\x1b[2m{question.tense}\x1b[0m" + (f"  \x1b[2;3m{question.source}\x1b[0m" if question.source else ""))
+
+			retry = True
+			while retry:
+				retry = False
+				start = time.perf_counter()
+				try:
+					user_answer = slot_input(from_colour, to_colour, question.verb.upper(), _to.upper(), question.pronoun.ljust(PADDING, " "), len(target.lword), hint_slots(target.lword))
+				except KeyboardInterrupt:
+					user_answer = None
+				latency = time.perf_counter() - start
+
+				if user_answer is None:
+					return
+
+				if not user_answer:
+					grade = SKIPPED
+				else:
+					grade = answer_matcher.grade(target, user_answer)
+				journal.record(pair, question.key, grade, latency)
+
+				if grade == SKIPPED:
+					print(f"            {question.pronoun:>{PADDING}s} {question.expected}")
+					failed[question.key] = [RETRY_FAILED, question]
+				elif grade == CORRECT:
+					print(f"\x1b[1;32m✔ Correct !\x1b[0m")
+				elif grade == TYPO:
+					print(f"\x1b[1;33m✔ Typo\x1b[0m      {question.pronoun:>{PADDING}s} {question.expected}")
+				elif grade == ALMOST:
+					print(f"\x1b[1;33m  Almost!\x1b[0m")
+					retry = True
+				else:
+					print(f"\x1b[1;31m⨯ Incorrect\x1b[0m {question.pronoun:>{PADDING}s} {question.expected}")
+					failed[question.key] = [RETRY_FAILED, question]
+			for v in failed.values():
+				v[0] -= 1
+			print()
+	finally:
+		journal.close()
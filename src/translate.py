@@ -16,69 +16,340 @@
 
 import sys
 import re
-from wrpy import WordReference
+import copy
+import contextvars
+import json
+from functools import cache
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup
+from wrpy import get_available_dicts
+from wrpy.services import parse_entry
+
+from .cache import JsonCache
+from .examples import store_examples
+from .forms import resolve_form
+from .fuzzy import spellcheck, known_word
+from .pages import PageCache, NO_ANSWER, deadline, remaining
 
 
 WORD_CONTEXT_ADJUST = 28
 WORD_FROM_ADJUST_FULL = 25
 WORD_FROM_ADJUST = WORD_FROM_ADJUST_FULL - 10
 
-def translate_word(_from: str, _to: str, word: str, compound_forms: bool = False, compact: bool = False, main_translations: bool = False, get_first_string: bool = False):
-	data = {}
-	changed_to_english = False
-	while not data:
+PIVOT_LANGUAGE = "en"
+PIVOT_CANDIDATES = 3
+FALLBACK_MEANINGS = 3
+
+WR_URL = "https://www.wordreference.com/{dict_code}/{word}"
+
+_dicts_cache = JsonCache("wordreference", "dicts")
+
+
+@cache
+def available_dicts() -> dict:
+	"""WordReference dictionary codes ('esen', 'enfr', ...), fetched once and kept on disk."""
+	dicts = _dicts_cache.get("dicts")
+	if not dicts:
+		dicts = get_available_dicts()
+		_dicts_cache.set("dicts", dicts)
+	return dicts
+
+
+def parse_wordreference(html: str, word: str, _from: str, _to: str) -> dict | None:
+	"""WordReference page as `wrpy.WordReference.translate` returns it, None when the word has no entry."""
+	soup = BeautifulSoup(html, "html.parser")
+	if soup.find("p", id="noEntryFound"):
+		return None
+
+	labels = available_dicts()[_from+_to]
+	translation = dict(
+		word=word,
+		from_lang=labels["from"],
+		to_lang=labels["to"],
+		url=WR_URL.format(dict_code=_from+_to, word=word),
+		translations=[],
+	)
+	sections = {}
+	for table in soup.find_all("table", "WRD"):
+		entries = []
+		entry = []
+		rows = table.find_all("tr", ["even", "odd"])
+		if not rows:
+			continue
+		last_row_class = rows[0]["class"][0]
+		for tr in rows:
+			if tr["class"][0] != last_row_class:
+				entries.append(parse_entry(entry))
+				entry = []
+				last_row_class = tr["class"][0]
+			entry.append(tr)
+		if entry:
+			entries.append(parse_entry(entry))
+
+		title = table.tr.td["title"]
+		if title not in sections:
+			sections[title] = {"title": title, "entries": []}
+			translation["translations"].append(sections[title])
+		sections[title]["entries"].extend(entries)
+	return translation
+
+
+@cache
+def _translation_cache(_from: str, _to: str) -> PageCache:
+	return PageCache(
+		("wordreference", _from+_to),
+		lambda word: WR_URL.format(dict_code=_from+_to, word=word),
+		lambda html, word: parse_wordreference(html, word, _from, _to),
+		lambda word, data: store_examples(_from, _to, data),
+	)
+
+
+def fetch_translation(_from: str, _to: str, word: str) -> dict:
+	"""Single dictionary hop, cached per language pair. Raise NameError when the word has no entry."""
+	data = _translation_cache(_from, _to).get(word.strip().lower())
+	if data is None:
+		raise NameError(f"No translation for '{word}'")
+	return copy.deepcopy(data)
+
+
+def pivot_candidates(data: dict) -> list[str]:
+	"""Distinct meanings of the principal translations, in order of appearance."""
+	meanings = []
+	for translation in data["translations"][:1]:
+		for entry in translation["entries"]:
+			for to_word in entry["to_word"]:
+				meaning = to_word["meaning"].strip()
+				if meaning and meaning not in meanings:
+					meanings.append(meaning)
+				if len(meanings) >= PIVOT_CANDIDATES:
+					return meanings
+	return meanings
+
+
+def lookup_word(_from: str, _to: str, word: str) -> dict:
+	"""Return WordReference data for `word`, going through English when the pair has no dictionary.
+	Pivoted results carry `pivot` and each section is tagged with the English meaning it came `via`.
+	"""
+	dicts = available_dicts()
+	if _from+_to in dicts:
+		return fetch_translation(_from, _to, word)
+
+	if PIVOT_LANGUAGE in (_from, _to) or _from+PIVOT_LANGUAGE not in dicts or PIVOT_LANGUAGE+_to not in dicts:
+		raise NotImplementedError(f"{_from}{_to} is not available as a translation dictionary")
+
+	first = fetch_translation(_from, PIVOT_LANGUAGE, word)
+	meanings = pivot_candidates(first)
+
+	def second_hop(meaning: str) -> dict | None:
 		try:
-			data = WordReference(_from, _to).translate(word)
-		except NotImplementedError:
-			print(f"\x1b[31mTranslation dictionary '{_from} <> {_to}' not available\x1b[0m", file=sys.stderr)
-			if _from != "en":
-				_from = "en"
-				changed_to_english = True
-				continue
-			return
+			return fetch_translation(PIVOT_LANGUAGE, _to, meaning)
 		except NameError:
-			print(f"Error: No translation for '{word}'", file=sys.stderr)
-			return
+			return None
 
-	if changed_to_english:
-		print(f"\x1b[31m  changed to '{_from} <> {_to}' instead\x1b[0m\n")
+	with ThreadPoolExecutor(max_workers=max(len(meanings), 1)) as executor:
+		# Each hop in a copy of the caller's context, under its deadline
+		futures = [executor.submit(contextvars.copy_context().run, second_hop, m) for m in meanings]
+		hops = [(m, f.result()) for m, f in zip(meanings, futures) if f.result() is not None]
+	return _pivoted(word, first, hops)
 
-	if get_first_string:
-		if data["translations"] and data["translations"][0]["entries"]:
-			first_entry = data["translations"][0]["entries"][0]
-			if first_entry["to_word"]:
-				# print(next((
-				# 	w["meaning"]
-				# 	for w in first_entry["to_word"]
-				# 	if not re.search(r"\b(out|in)$", w["meaning"])
-				# ), None))
-				return next((
-					w["meaning"]
-					for w in first_entry["to_word"]
-					if not re.search(r"\b(out|in)$", w["meaning"])
-				), None)
+
+def _cached_translation(_from: str, _to: str, word: str) -> dict | None:
+	"""`fetch_translation` from the cache only: None when the page is not cached."""
+	entries = _translation_cache(_from, _to).entries
+	key = word.strip().lower()
+	if key not in entries:
 		return None
+	data = entries.get(key)
+	if data is None:
+		raise NameError(f"No translation for '{word}'")
+	return copy.deepcopy(data)
 
-	def show_unique(translation: dict):
-		if translation['notes'] is not None:
-			translation['notes'] = re.sub(r"^can,\s*", "", translation['notes'], flags=re.IGNORECASE).strip()
-			if translation['notes']:
-				translation['notes'] += ", "
-		else:
-			translation['notes'] = ''
-		# translation['grammar'] = re.sub(r"(n(m|f)|pl)+", r"\1. ", translation['grammar'], flags=re.IGNORECASE).strip()
-		return f"\x1b[1m{translation['meaning']}  \x1b[2m{translation['notes']}{translation['grammar']}.\x1b[0m"
 
-	def print_unique_example(text_from: str, text_to: str, padding: int = 0):
-		print(f"{'':>{padding}s}\x1b[2m{text_from}\n{'':>{padding}s}\x1b[3m{text_to}\x1b[0m")
+def cached_word(_from: str, _to: str, word: str) -> dict | None:
+	"""`lookup_word` from the pages already cached, without any request (nor waiting for one):
+	None when a page it needs is not cached. Raise NameError as `lookup_word`.
+	"""
+	# The list as cached: fetching it may be what failed
+	dicts = _dicts_cache.get("dicts") or {}
+	if _from+_to in dicts:
+		return _cached_translation(_from, _to, word)
+	if PIVOT_LANGUAGE in (_from, _to) or _from+PIVOT_LANGUAGE not in dicts or PIVOT_LANGUAGE+_to not in dicts:
+		return None
+
+	first = _cached_translation(_from, PIVOT_LANGUAGE, word)
+	if first is None:
+		return None
+	hops = []
+	for meaning in pivot_candidates(first):
+		try:
+			data = _cached_translation(PIVOT_LANGUAGE, _to, meaning)
+		except NameError:
+			continue
+		if data is None:
+			return None
+		hops.append((meaning, data))
+	return _pivoted(word, first, hops)
+
+
+def _pivoted(word: str, first: dict, hops: list[tuple[str, dict]]) -> dict:
+	"""Entry of `word` through the pivot language: its `first` hop, and the second `hops` by meaning."""
+	if not hops:
+		raise NameError(f"No translation for '{word}'")
+	return dict(
+		word=word,
+		from_lang=first["from_lang"],
+		to_lang=hops[0][1]["to_lang"],
+		pivot=first["to_lang"],
+		translations=[
+			dict(translation, via=meaning)
+			for meaning, d in hops
+			for translation in d["translations"]
+		],
+	)
+
+
+def first_meaning(data: dict) -> str | None:
+	"""First meaning of the first entry, skipping phrasal particles ('out', 'in')."""
+	if data["translations"] and data["translations"][0]["entries"]:
+		first_entry = data["translations"][0]["entries"][0]
+		if first_entry["to_word"]:
+			return next((
+				w["meaning"]
+				for w in first_entry["to_word"]
+				if not re.search(r"\b(out|in)$", w["meaning"])
+			), None)
+	return None
+
 
-	print(f"\x1b[1m{data['from_lang']} 🠲  {data['to_lang']}\x1b[0m")
+def local_translation(_from: str, _to: str, word: str) -> tuple[list[str], str] | None:
+	"""Meanings of `word` found without the network, and where: the cached entries of the
+	reverse dictionary, the aligned frequency lists, else the installed Argos model (within
+	a deadline, only if it is loaded already).
+	"""
+	lword = word.strip().lower()
+	meanings = [
+		key for key, data in _translation_cache(_to, _from).entries.items()
+		if data is not None and any(
+			to_word["meaning"].strip().lower() == lword
+			for translation in data["translations"][:1]
+			for entry in translation["entries"]
+			for to_word in entry["to_word"]
+		)
+	]
+	if meanings:
+		return meanings[:FALLBACK_MEANINGS], "cached entries"
+
+	from .train import load_wordlist
+	try:
+		meaning = load_wordlist(_from, _to).get(lword)
+	except FileNotFoundError:
+		meaning = None
+	if meaning:
+		return [meaning], "frequency list"
+
+	try:
+		from .translate_text import load_translation, loaded_translation
+		# Loading a model takes seconds: past a deadline, only one loaded already
+		translation = load_translation(_from, _to, download=False) if remaining() is None else loaded_translation(_from, _to)
+	except ImportError:
+		translation = None
+	if translation is not None:
+		return [translation.translate(word)], "Argos"
+	return None
+
+
+def fallback_data(_from: str, _to: str, word: str, meanings: list[str], source: str) -> dict:
+	"""`local_translation`'s answer shaped as a WordReference entry, marked with its `fallback` source."""
+	# The list as cached: fetching it is what may have failed
+	labels = (_dicts_cache.get("dicts") or {}).get(_from+_to, {"from": _from, "to": _to})
+	return dict(
+		word=word,
+		from_lang=labels["from"],
+		to_lang=labels["to"],
+		fallback=source,
+		translations=[dict(
+			title=f"Fallback: {source}",
+			entries=[dict(
+				from_word=dict(source=word, grammar=""),
+				context="",
+				to_word=[dict(meaning=meaning, notes="", grammar="") for meaning in meanings],
+				from_example=None,
+				to_example=[],
+			)],
+		)],
+	)
+
+
+NOTE_PREFIX = re.compile(r"^can,\s*", re.IGNORECASE)
+
+OUTPUT_FORMATS = ("ansi", "json", "ndjson", "tsv")
+ROW_FIELDS = ("title", "via", "from_word", "from_grammar", "context", "meaning", "notes", "grammar", "from_example", "to_example")
+
+
+def select_translations(data: dict, compound_forms: bool = False, main_translations: bool = False):
+	"""Sections of `data` to show: compound forms on request, and only the first section
+	(of each pivot meaning) with `main_translations`.
+	"""
+	shown_via = set()
 	for translation in data["translations"]:
-		if translation['title'].strip().lower() == "compound forms":
-			if not compound_forms:
+		if translation['title'].strip().lower() == "compound forms" and not compound_forms:
+			continue
+		via = translation.get("via")
+		if main_translations and via is not None:
+			if via in shown_via:
 				continue
+			shown_via.add(via)
+		yield translation
+		if main_translations and via is None:
+			break
+
+
+def _notes(to_word: dict) -> str:
+	return NOTE_PREFIX.sub("", to_word['notes']).strip() if to_word['notes'] else ""
+
+
+def translation_rows(translations):
+	"""One flat dict (ROW_FIELDS) per meaning."""
+	for translation in translations:
+		for entry in translation["entries"]:
+			for to_word in entry["to_word"]:
+				yield dict(
+					title=translation['title'],
+					via=translation.get("via"),
+					from_word=entry['from_word']['source'],
+					from_grammar=entry['from_word']['grammar'],
+					context=entry['context'] or "",
+					meaning=to_word['meaning'],
+					notes=_notes(to_word),
+					grammar=to_word['grammar'],
+					from_example=entry['from_example'],
+					to_example=" / ".join(entry['to_example']) or None,
+				)
+
+
+def render_ansi(data: dict, translations, word: str, _from: str, _to: str, compact: bool = False) -> str:
+	out = []
+
+	def show_unique(to_word: dict) -> str:
+		notes = _notes(to_word)
+		if notes:
+			notes += ", "
+		return f"\x1b[1m{to_word['meaning']}  \x1b[2m{notes}{to_word['grammar']}.\x1b[0m"
+
+	if "pivot" in data:
+		out.append(f"\x1b[1m{data['from_lang']} 🠲  {data['pivot']} 🠲  {data['to_lang']}\x1b[0m")
+		out.append(f"\x1b[31m  pivoted through '{PIVOT_LANGUAGE}', '{_from} <> {_to}' not available\x1b[0m")
+	else:
+		out.append(f"\x1b[1m{data['from_lang']} 🠲  {data['to_lang']}\x1b[0m")
+	if "fallback" in data:
+		out.append(f"\x1b[33m  from the {data['fallback']}, no answer from WordReference\x1b[0m")
+	for translation in translations:
+		via = translation.get("via")
 		# Title
-		print(f"\n\n\x1b[1m{translation['title']}\x1b[0m")
+		if via is None:
+			out.append(f"\n\n\x1b[1m{translation['title']}\x1b[0m")
+		else:
+			out.append(f"\n\n\x1b[1m{translation['title']}\x1b[0;2m  ({word} 🠲  {via})\x1b[0m")
 		previous_word_from = ""
 		previous_context = ""
 		for entry in translation["entries"]:
@@ -86,20 +357,98 @@ def translate_word(_from: str, _to: str, word: str, compound_forms: bool = False
 			word_from = f"{entry['from_word']['source']}\x1b[0;2m {entry['from_word']['grammar']}.\x1b[0m"
 			context = entry['context'] or ""
 			if word_from != previous_word_from:
-				print(f"  {word_from.ljust(WORD_FROM_ADJUST_FULL)}")
+				out.append(f"  {word_from.ljust(WORD_FROM_ADJUST_FULL)}")
 				previous_word_from = word_from
 
 			for to_word in entry["to_word"]:
 				if context == previous_context:
-					print(f"  {''.rjust(WORD_CONTEXT_ADJUST)}  {show_unique(to_word)}")
+					out.append(f"  {''.rjust(WORD_CONTEXT_ADJUST)}  {show_unique(to_word)}")
 				else:
-					print(f"  {context.rjust(WORD_CONTEXT_ADJUST)}: {show_unique(to_word)}")
+					out.append(f"  {context.rjust(WORD_CONTEXT_ADJUST)}: {show_unique(to_word)}")
 					previous_context = context
-				
+
 			# Example
 			if not compact and entry["from_example"] is not None and len(entry["to_example"]) != 0:
-				print_unique_example(entry["from_example"], entry["to_example"][0], 8)
-			print()
+				out.append(f"{'':>8s}\x1b[2m{entry['from_example']}\n{'':>8s}\x1b[3m{entry['to_example'][0]}\x1b[0m")
+			out.append("")
+	return "\n".join(out) + "\n"
+
+
+def render_json(data: dict, translations) -> str:
+	return json.dumps(dict(data, translations=list(translations)), ensure_ascii=False) + "\n"
+
+
+def render_ndjson(translations) -> str:
+	return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in translation_rows(translations))
+
+
+def render_tsv(translations) -> str:
+	clean = lambda v: "" if v is None else str(v).replace("\t", " ").replace("\n", " ")
+	lines = ["\t".join(ROW_FIELDS)]
+	lines.extend("\t".join(clean(row[k]) for k in ROW_FIELDS) for row in translation_rows(translations))
+	return "\n".join(lines) + "\n"
+
+
+def lookup_fallback(_from: str, _to: str, word: str) -> dict | None:
+	"""Best answer once WordReference missed the deadline or could not be reached: the
+	local one, unless the dictionary answered while it was computed (a late download
+	carries on meanwhile).
+	"""
+	local = local_translation(_from, _to, word)
+	try:
+		# No time left: served if cached by now, without asking again
+		data = cached_word(_from, _to, word)
+	except NameError:
+		data = None
+	if data is not None:
+		return data
+	return None if local is None else fallback_data(_from, _to, word, *local)
+
+
+def word_data(_from: str, _to: str, word: str) -> dict:
+	"""WordReference data of `word` as given, nothing printed; past the deadline or offline,
+	the local answer (`fallback_data`). Raise NameError, NotImplementedError, or one of
+	NO_ANSWER when there is neither.
+	"""
+	with deadline():
+		try:
+			return lookup_word(_from, _to, word)
+		except NO_ANSWER:
+			# Within the deadline still, so that no model is loaded past it
+			data = lookup_fallback(_from, _to, word)
+			if data is None:
+				raise
+			return data
+
+
+def translate_word(_from: str, _to: str, word: str, compound_forms: bool = False, compact: bool = False, main_translations: bool = False, get_first_string: bool = False, output_format: str = "ansi"):
+	if not get_first_string:
+		# Common words are looked up as typed ("como"), rarer inflected forms by their infinitive
+		word = (None if known_word(_from, word) else resolve_form(_from, word)) or spellcheck(_from, word)
+	try:
+		data = word_data(_from, _to, word)
+	except NotImplementedError:
+		print(f"\x1b[31mTranslation dictionary '{_from} <> {_to}' not available\x1b[0m", file=sys.stderr)
+		return
+	except NameError:
+		print(f"Error: No translation for '{word}'", file=sys.stderr)
+		return
+	except NO_ANSWER as e:
+		print(f"Error: No answer for '{word}' ({e}), nor offline", file=sys.stderr)
+		return
+
+	if get_first_string:
+		return first_meaning(data)
 
-		if main_translations:
-			break
\ No newline at end of file
+	translations = select_translations(data, compound_forms, main_translations)
+	if output_format == "json":
+		out = render_json(data, translations)
+	elif output_format == "ndjson":
+		out = render_ndjson(translations)
+	elif output_format == "tsv":
+		out = render_tsv(translations)
+	else:
+		out = render_ansi(data, translations, word, _from, _to, compact)
+	# One write for the whole result, rather than a print per line
+	sys.stdout.write(out)
+	sys.stdout.flush()
@@ -14,9 +14,218 @@
 # 
 ################################################################################
 
-import os, json
+import os, sys, json
+from functools import cache
 from pathlib import Path
 
+from .packs import extract_argos
+from .storage import shared_path
+from .sentences import sentencizer, covers
+
+
+# CTranslate2 inference settings. CPU only: int8 weights are ~3x faster than
+# float32 for a small quality loss, beam search costs roughly linearly in beam
+# size, and batch size is in tokens (argos batches by tokens). A single process
+# translates one text at a time, so all threads go to intra-op parallelism.
+TRANSLATE_PROFILES = {
+	"fast": {"compute_type": "int8", "beam_size": 1, "batch_size": 1024, "inter_threads": 1},
+	"balanced": {"compute_type": "int8", "beam_size": 2, "batch_size": 512, "inter_threads": 1},
+	"quality": {"compute_type": "float32", "beam_size": 4, "batch_size": 64, "inter_threads": 1},
+}
+DEFAULT_PROFILE = "balanced"
+
+# "rules": src/sentences.py, no model to load; "argos": the package's own (Stanza/MiniSBD)
+SENTENCIZERS = ("rules", "argos")
+DEFAULT_SENTENCIZER = "rules"
+
+_profile = {"name": None, "applied": None}
+_sentencizer = {"name": None}
+
+
+def set_profile(name: str | None = None):
+	"""Select the inference profile: `name`, else TRANSLATE_PROFILE from .env, else DEFAULT_PROFILE.
+	Applied before the next translation; models already loaded are reloaded with it.
+	"""
+	name = name or os.getenv("TRANSLATE_PROFILE", DEFAULT_PROFILE)
+	if name not in TRANSLATE_PROFILES:
+		print(f"Unknown translate profile '{name}' (available: {', '.join(TRANSLATE_PROFILES)}), using '{DEFAULT_PROFILE}'", file=sys.stderr)
+		name = DEFAULT_PROFILE
+	_profile["name"] = name
+	if "argostranslate.settings" in sys.modules:
+		_apply_profile()
+
+
+def _thread_budget() -> int:
+	# TRANSLATE_THREADS caps the cores used, e.g. when several services share the host
+	return int(os.getenv("TRANSLATE_THREADS", "0")) or os.cpu_count() or 1
+
+
+def _layers(translation):
+	"""The argos translation and the ones it wraps (CachedTranslation) or chains (CompositeTranslation)."""
+	yield translation
+	for attr in ("underlying", "t1", "t2"):
+		part = getattr(translation, attr, None)
+		if part is not None:
+			yield from _layers(part)
+
+
+def _reset_translator(translation):
+	"""Drop the loaded model of an argos translation, recreated with the current settings on next use."""
+	for layer in _layers(translation):
+		if hasattr(layer, "translator"):
+			layer.translator = None
+		if hasattr(layer, "cache"):
+			layer.cache = {}
+
+
+def _apply_profile():
+	import argostranslate.settings
+	import argostranslate.translate
+
+	if _profile["name"] is None:
+		set_profile()
+	if _profile["applied"] == _profile["name"]:
+		return
+
+	profile = TRANSLATE_PROFILES[_profile["name"]]
+	argostranslate.settings.compute_type = profile["compute_type"]
+	argostranslate.settings.beam_size = profile["beam_size"]
+	argostranslate.settings.batch_size = profile["batch_size"]
+	argostranslate.settings.inter_threads = profile["inter_threads"]
+	argostranslate.settings.intra_threads = max(1, _thread_budget() // profile["inter_threads"])
+
+	# The translator is created with the thread and compute settings of its first use
+	for installed in argostranslate.translate.installed_translates:
+		_reset_translator(installed.cached_translation)
+	_profile["applied"] = _profile["name"]
+
+
+def set_sentencizer(name: str | None = None):
+	"""Select the sentence splitter: `name`, else TRANSLATE_SENTENCIZER from .env, else DEFAULT_SENTENCIZER."""
+	name = name or os.getenv("TRANSLATE_SENTENCIZER", DEFAULT_SENTENCIZER)
+	if name not in SENTENCIZERS:
+		print(f"Unknown sentencizer '{name}' (available: {', '.join(SENTENCIZERS)}), using '{DEFAULT_SENTENCIZER}'", file=sys.stderr)
+		name = DEFAULT_SENTENCIZER
+	_sentencizer["name"] = name
+	if "argostranslate.translate" in sys.modules:
+		import argostranslate.translate
+		for installed in argostranslate.translate.installed_translates:
+			_use_sentencizer(installed.cached_translation)
+
+
+def _use_sentencizer(translation):
+	if _sentencizer["name"] is None:
+		set_sentencizer()
+	for layer in _layers(translation):
+		if hasattr(layer, "sentencizer"):
+			# Argos builds its sentencizer eagerly but loads the model on first split: keep it for "argos"
+			if not hasattr(layer, "argos_sentencizer"):
+				layer.argos_sentencizer = layer.sentencizer
+			rules = _sentencizer["name"] == "rules" and covers(layer.pkg.from_code)
+			layer.sentencizer = sentencizer(layer.pkg.from_code) if rules else layer.argos_sentencizer
+		if hasattr(layer, "cache"):
+			layer.cache = {}
+
+
+# Translations returned by `load_translation`, by pair
+_translations = {}
+
+
+def loaded_translation(from_code: str, to_code: str):
+	"""The pair's Argos translation if its models are already loaded in this process, else None:
+	translating with it takes no loading time.
+	"""
+	translation = _translations.get((from_code, to_code))
+	if translation is None or any(getattr(layer, "translator", True) is None for layer in _layers(translation)):
+		return None
+	return translation
+
+
+@cache
+def load_translation(from_code: str, to_code: str, download: bool = True):
+	"""Installed Argos translation for the pair, installing the package on first use
+	(None instead without `download`). Kept for the life of the process so the model
+	is only loaded once.
+	"""
+	import argostranslate.package
+	import argostranslate.settings
+	import argostranslate.translate
+
+	# Models provisioned once per host, next to the user-installed ones
+	shared = Path(shared_path("argos-packages"))
+	if shared.is_dir() and shared not in argostranslate.settings.package_dirs:
+		argostranslate.settings.package_dirs.append(shared)
+		argostranslate.translate.get_installed_languages.cache_clear()
+
+	_apply_profile()
+
+	def installed():
+		languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+		if from_code in languages and to_code in languages:
+			return languages[from_code].get_translation(languages[to_code])
+
+	translation = installed()
+	if translation is None:
+		# Models of an imported language pack, extracted on first use
+		packed = extract_argos(from_code, to_code)
+		if packed is not None:
+			if Path(packed) not in argostranslate.settings.package_dirs:
+				argostranslate.settings.package_dirs.append(Path(packed))
+			argostranslate.translate.get_installed_languages.cache_clear()
+			translation = installed()
+	if translation is None and not download:
+		return None
+	if translation is None:
+		# Download and install Argos Translate package
+		argostranslate.package.update_package_index()
+		available_packages = argostranslate.package.get_available_packages()
+
+		package_to_install = next(
+			filter(
+				lambda x: (x.from_code == from_code and x.to_code == to_code),
+				available_packages
+			)
+		)
+		argostranslate.package.install_from_path(package_to_install.download())
+		translation = installed()
+	_use_sentencizer(translation)
+	_translations[from_code, to_code] = translation
+	return translation
+
+
+def translate_words(translation, words: list[str]) -> list[str]:
+	"""Translate short independent texts (words) in one CTranslate2 batch.
+	`translate()` would run one batch per text; this does what argos'
+	`apply_packaged_translation` does, for many inputs at once. Chained
+	(pivot) translations fall back to one `translate()` per word.
+	"""
+	import argostranslate.settings
+
+	layer = next((l for l in _layers(translation) if hasattr(l, "pkg") and hasattr(l, "translator")), None)
+	if layer is None or getattr(translation, "t1", None) is not None:
+		return [translation.translate(w) for w in words]
+	if layer.translator is None:
+		translation.translate(words[0])		# loads the model with the current settings
+
+	pkg = layer.pkg
+	tokenized = [pkg.tokenizer.encode(w) for w in words]
+	results = layer.translator.translate_batch(
+		tokenized,
+		target_prefix=[[pkg.target_prefix]] * len(tokenized) if pkg.target_prefix else None,
+		replace_unknowns=True,
+		max_batch_size=argostranslate.settings.batch_size,
+		batch_type="tokens",
+		beam_size=argostranslate.settings.beam_size,
+		num_hypotheses=1,
+	)
+	translated = []
+	for result in results:
+		value = pkg.tokenizer.decode(result.hypotheses[0])
+		if pkg.target_prefix and value.startswith(pkg.target_prefix):
+			value = value[len(pkg.target_prefix):]
+		translated.append(value.strip())
+	return translated
+
 
 def translate_text(from_code: str, to_code: str, text: str) -> str:
 
@@ -44,22 +253,7 @@ def translate_text(from_code: str, to_code: str, text: str) -> str:
 	# 		print(key)
 	# 		return
 
-	import argostranslate.package
-	import argostranslate.translate
- 
-	# Download and install Argos Translate package
-	argostranslate.package.update_package_index()
-	available_packages = argostranslate.package.get_available_packages()
-
-	package_to_install = next(
-		filter(
-			lambda x: (x.from_code == from_code and x.to_code == to_code),
-			available_packages
-		)
-	)
-	argostranslate.package.install_from_path(package_to_install.download())
-
-	translation = argostranslate.translate.translate(text, from_code, to_code)
+	translation = load_translation(from_code, to_code).translate(text)
 	print(translation)
 
 	# if text != translation and len(text) < 200000000:
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+################################################################################
+# @file      wordlist.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   src
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+# Aligned concept matrix over the frequency wordlists.
+# 
+# Line N of every `wordfrequency.info/<lang>.txt` is the same concept, so the
+# lists form a matrix: one row per concept, one column per language. Each
+# column is stored once in its own file, so adding a language appends a column
+# without touching the others, and only the columns in use are mapped:
+# 
+#   ~/.cache/language-learning/wordlist/manifest.json   {"columns": {lang: {...}}}
+#   ~/.cache/language-learning/wordlist/<lang>.col      MAGIC | count | offsets[count+1] | utf-8 blob
+# 
+# Columns provisioned in the shared cache or in a language pack (see packs.py)
+# are used when there is no frequency list to build the user copy from.
+
+import os
+import mmap
+import struct
+from array import array
+from functools import cache
+
+from .packs import find_member
+from .storage import PATH_CACHE, shared_path, locked, atomic_write, read_json, write_json
+
+
+WORDLIST_PATH = os.path.join(os.path.dirname(__file__), "most-common-words-multilingual/data/wordfrequency.info")
+MATRIX_PATH = os.path.join(PATH_CACHE, "wordlist")
+MANIFEST_PATH = os.path.join(MATRIX_PATH, "manifest.json")
+
+COLUMN_MAGIC = b"LLC1"
+HEADER = struct.Struct("<4sI")
+
+
+class Column:
+	"""Read-only memory-mapped column, indexed by concept row.
+	`offset`: where the column starts in the file (a column stored in a language pack).
+	"""
+	def __init__(self, path: str, offset: int = 0):
+		self.path = path
+		self.offset = offset
+		with open(path, "rb") as f:
+			self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, self.count = HEADER.unpack_from(self.map, offset)
+		if magic != COLUMN_MAGIC:
+			raise ValueError(f"'{path}' is not a wordlist column")
+		self.offsets = memoryview(self.map)[offset + HEADER.size:offset + HEADER.size + 4 * (self.count + 1)].cast("I")
+		self.base = offset + HEADER.size + 4 * (self.count + 1)
+
+	def __len__(self) -> int:
+		return self.count
+
+	def __getitem__(self, row: int) -> str:
+		if not 0 <= row < self.count:
+			raise IndexError(row)
+		return self.map[self.base + self.offsets[row]:self.base + self.offsets[row + 1]].decode("utf-8")
+
+	def __iter__(self):
+		return (self[i] for i in range(self.count))
+
+	def data(self) -> bytes:
+		"""The column as written by `write_column_file`."""
+		return self.map[self.offset:self.base + self.offsets[self.count]]
+
+
+def _load_manifest() -> dict:
+	return read_json(MANIFEST_PATH, {"columns": {}})
+
+
+def write_column_file(path: str, words: list[str]):
+	"""Write `words` in the column format readable by `Column`."""
+	blobs = [w.encode("utf-8") for w in words]
+	offsets = array("I", [0])
+	for b in blobs:
+		offsets.append(offsets[-1] + len(b))
+
+	atomic_write(path, HEADER.pack(COLUMN_MAGIC, len(blobs)) + offsets.tobytes() + b"".join(blobs))
+
+
+def write_column(lang: str, words: list[str], source: str | None = None):
+	"""Store `words` (one per concept row) as the column for `lang` and register it."""
+	write_column_file(os.path.join(MATRIX_PATH, lang + ".col"), words)
+
+	# Another process may register its own column meanwhile: re-read under the lock
+	with locked(MANIFEST_PATH):
+		manifest = _load_manifest()
+		manifest["columns"][lang] = {
+			"rows": len(words),
+			"source": source,
+			"mtime": os.path.getmtime(source) if source else None,
+		}
+		write_json(MANIFEST_PATH, manifest)
+	column.cache_clear()
+
+
+def build_column(lang: str):
+	"""(Re)build the column of `lang` from its frequency list."""
+	source = os.path.join(WORDLIST_PATH, lang + ".txt")
+	with open(source, "r") as f:
+		write_column(lang, [line.strip() for line in f.read().splitlines()], source)
+
+
+def _is_stale(lang: str, manifest: dict) -> bool:
+	entry = manifest["columns"].get(lang)
+	if entry is None or not os.path.exists(os.path.join(MATRIX_PATH, lang + ".col")):
+		return True
+	if entry["source"] and os.path.exists(entry["source"]):
+		return os.path.getmtime(entry["source"]) != entry["mtime"]
+	return False
+
+
+def languages() -> list[str]:
+	"""Languages available as columns, built or buildable from a frequency list."""
+	langs = set(_load_manifest()["columns"])
+	if os.path.isdir(WORDLIST_PATH):
+		langs.update(f[:-4] for f in os.listdir(WORDLIST_PATH) if f.endswith(".txt"))
+	return sorted(langs)
+
+
+@cache
+def column(lang: str) -> Column:
+	"""Column for `lang`, appended to the matrix on first use."""
+	if _is_stale(lang, _load_manifest()):
+		if not os.path.exists(os.path.join(WORDLIST_PATH, lang + ".txt")):
+			shared = shared_path("wordlist", lang + ".col")
+			if os.path.exists(shared):
+				return Column(shared)
+			# Mapped in place from the language pack
+			packed = find_member("wordlist", lang + ".col")
+			if packed is not None and packed[0].offset(packed[1]) is not None:
+				return Column(packed[0].path, packed[0].offset(packed[1]))
+		build_column(lang)
+	return Column(os.path.join(MATRIX_PATH, lang + ".col"))
+
+
+def concepts(*langs: str):
+	"""Iterate concept rows as tuples, one word per requested language."""
+	columns = [column(lang) for lang in langs]
+	for row in range(min(len(c) for c in columns)):
+		yield tuple(c[row] for c in columns)
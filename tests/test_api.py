@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+################################################################################
+# @file      test_api.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   tests
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+
+import asyncio
+
+import pytest
+
+import src.storage
+import src.train
+from src import api
+
+
+WORDLIST = {"house": "casa", "dog": "perro", "cat": "gato"}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+	monkeypatch.setattr(src.storage, "PATH_CACHE", str(tmp_path))
+	monkeypatch.setattr(src.train, "load_wordlist", lambda _from, _to: dict(WORDLIST))
+	return tmp_path
+
+
+async def _learn_all(learner: str):
+	"""Answer every card right; return the words drawn."""
+	drawn = []
+	async with await api.Trainer.open("en", "es", learner=learner) as trainer:
+		while (card := await trainer.next()) is not None:
+			drawn.append(card["word"])
+			assert (await trainer.answer(WORDLIST[card["word"]]))["correct"]
+	return drawn
+
+
+async def _session(learner: str) -> tuple[set, set]:
+	"""(deck, words never failed) of a new session of `learner`."""
+	async with await api.Trainer.open("en", "es", learner=learner) as trainer:
+		return set(trainer.trainer.wordlist), trainer.trainer.journal.never_failed_words("enes")
+
+
+def test_learners_have_separate_journals(cache):
+	assert sorted(asyncio.run(_learn_all("alice"))) == sorted(WORDLIST)
+
+	# Alice's answers are in her journal only; they leave every deck whole
+	assert asyncio.run(_session("alice")) == (set(WORDLIST), set(WORDLIST))
+	assert asyncio.run(_session("bob")) == (set(WORDLIST), set())
+	assert (cache / "learners" / "alice" / "journal.jsonl").exists()
+	assert not (cache / "learners" / "bob" / "journal.jsonl").exists()
+
+
+def test_learner_id_is_a_file_name(cache):
+	with pytest.raises(ValueError):
+		asyncio.run(api.Trainer.open("en", "es", learner="../alice"))
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+################################################################################
+# @file      test_examples.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   tests
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+
+import pytest
+
+from src import examples
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+	"""An empty fr > en corpus with tiny blocks, so that queries skip through several."""
+	monkeypatch.setattr(examples, "EXAMPLES_PATH", str(tmp_path))
+	monkeypatch.setattr(examples, "extract", lambda *path: None)
+	monkeypatch.setattr(examples, "BLOCK", 4)
+	return examples.ExampleIndex("fr", "en")
+
+
+def _pairs(start, stop):
+	return [(f"phrase {i} {'pair' if i % 2 else 'impair'}", f"sentence {'three' if i % 3 == 0 else 'other'}") for i in range(start, stop)]
+
+
+def test_search_intersects_across_blocks(index):
+	assert index.add(_pairs(0, 50)) == 50
+	found = index.search("impair three", limit=100)
+	assert found == [p for p in _pairs(0, 50) if p[0].endswith("impair") and p[1].endswith("three")]
+	assert index.search("impair three", limit=3) == found[:3]
+	assert index.search("impair missing") == []
+
+
+def test_appends_are_compacted(index):
+	for i in range(0, 30, 3):
+		index.add(_pairs(i, i + 3))
+	assert index.add(_pairs(0, 3)) == 0
+	with index.connect() as db:
+		counts = [row[0] for row in db.execute("SELECT count FROM postings WHERE term = 'phrase' ORDER BY first")]
+	assert sum(counts) == 30
+	assert all(count == examples.BLOCK for count in counts[:-1])
+	assert index.search("pair", limit=100) == [p for p in _pairs(0, 30) if p[0].endswith(" pair")]
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+################################################################################
+# @file      test_fallback.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   tests
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+
+import importlib
+import json
+import time
+
+import pytest
+import requests
+
+import src.fetch
+import src.storage
+import src.train
+from src import api, conjugation, pages, translate
+
+
+TABLE = {"Indicativo": {"Presente": {"yo ": "como", "tú ": "comes"}}}
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+	"""No network at all, a frequency list with one concept, an empty cache."""
+	def unreachable(url, **kwargs):
+		raise requests.ConnectionError(f"Failed to establish a new connection: {url}")
+	monkeypatch.setattr(src.storage, "PATH_CACHE", str(tmp_path))
+	monkeypatch.setattr(src.fetch.SESSION, "get", unreachable)
+	monkeypatch.setattr(src.train, "load_wordlist", lambda _from, _to: {"maison": "Haus", "comer": "manger"})
+	monkeypatch.setattr(translate, "available_dicts", lambda: {"frde": {"from": "French", "to": "German"}, "esfr": {"from": "Spanish", "to": "French"}})
+	for module in (translate, conjugation):
+		monkeypatch.setattr(module, "resolve_form", lambda lang, word: None)
+		monkeypatch.setattr(module, "spellcheck", lambda lang, word: word)
+	monkeypatch.setattr(translate, "known_word", lambda lang, word: True)
+	translate._translation_cache.cache_clear()
+	conjugation._conjugation_cache.cache_clear()
+	yield
+	translate._translation_cache.cache_clear()
+	conjugation._conjugation_cache.cache_clear()
+
+
+@pytest.mark.parametrize("budget", [None, 0.5])
+def test_word_answered_locally_when_unreachable(offline, capsys, budget):
+	pages.set_deadline(budget)
+	try:
+		translate.translate_word("fr", "de", "maison", output_format="json")
+	finally:
+		pages.set_deadline(None)
+	data = json.loads(capsys.readouterr().out)
+	assert data["fallback"] == "frequency list"
+	assert data["translations"][0]["entries"][0]["to_word"][0]["meaning"] == "Haus"
+
+
+def test_conjugation_shows_cached_table_when_unreachable(offline):
+	conjugation._conjugation_cache("es").entries.set("comer", TABLE)
+	verb, data, verb_from, data_from = conjugation.conjugation_data("fr", "es", "comer")
+	assert (verb, data.dict(), verb_from, data_from) == ("comer", TABLE, "manger", None)
+
+
+def test_conjugation_without_cached_table_is_an_error(offline):
+	with pytest.raises(conjugation.ConjugationError):
+		conjugation.conjugation_data("fr", "es", "beber")
+
+
+def test_api_prints_nothing(offline, monkeypatch, capsys):
+	def spellcheck(lang, word):
+		print(f"Did you mean: {word} ?")
+		return word
+	monkeypatch.setattr(conjugation, "spellcheck", spellcheck)
+	conjugation._conjugation_cache("es").entries.set("comer", TABLE)
+	assert api._conjugate("fr", "es", "comer")["tables"] == TABLE
+	assert api._lookup("fr", "de", "maison")["fallback"] == "frequency list"
+	assert capsys.readouterr() == ("", "")
+
+
+def test_due_page_revalidated_in_background_only(offline, monkeypatch):
+	scheduled = []
+	monkeypatch.setattr(pages, "_schedule", lambda cache, key: scheduled.append(key))
+	cache = conjugation._conjugation_cache("es")
+	cache.entries.set("comer", TABLE)
+	cache.validators.set("comer", {"etag": None, "last_modified": None, "checked": 0})
+	monkeypatch.setitem(pages._refresh, "background", False)
+	assert cache.get("comer") == TABLE and scheduled == []
+	monkeypatch.setitem(pages._refresh, "background", True)
+	assert cache.get("comer") == TABLE and scheduled == ["comer"]
+
+
+def test_failed_revalidation_backs_off(offline):
+	cache = conjugation._conjugation_cache("es")
+	cache.entries.set("comer", TABLE)
+	cache.validators.set("comer", {"etag": None, "last_modified": None, "checked": 0})
+	assert cache.due("comer")
+	with pytest.raises(requests.RequestException):
+		cache.revalidate("comer")
+	assert not cache.due("comer")
+	assert cache.due("comer", time.time() + pages.RETRY_AFTER + 1)
+	assert cache.validators.get("comer")["failures"] == 1
+
+
+def test_fallback_only_reads_the_cache(offline, monkeypatch):
+	def submitted(*args):
+		raise AssertionError("a request was submitted")
+	monkeypatch.setattr(pages, "_late_executor", submitted)
+	monkeypatch.setattr(translate._dicts_cache, "get", lambda key: {"frde": {"from": "French", "to": "German"}})
+	assert translate.lookup_fallback("fr", "de", "maison")["fallback"] == "frequency list"
+	# The page arrived late: served as cached
+	data = {"word": "maison", "from_lang": "French", "to_lang": "German", "translations": []}
+	translate._translation_cache("fr", "de").entries.set("maison", data)
+	assert translate.lookup_fallback("fr", "de", "maison") == data
+
+
+def test_no_model_loaded_past_the_deadline(offline, monkeypatch):
+	loaded = []
+	# The module, not the function src re-exports under its name
+	monkeypatch.setattr(importlib.import_module("src.translate_text"), "load_translation", lambda *args, **kwargs: loaded.append(args))
+	with pages.deadline(0):
+		assert translate.local_translation("fr", "de", "chien") is None
+	assert loaded == []
+	translate.local_translation("fr", "de", "chien")
+	assert loaded == [("fr", "de")]
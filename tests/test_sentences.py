@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+################################################################################
+# @file      test_sentences.py
+# @brief     
+# @date      Mo Oct 2026
+# @author    Dimitri Simon
+# 
+# PROJECT:   tests
+# 
+# MODIFIED:  Mon Oct 19 2026
+# BY:        Dimitri Simon
+# 
+# Copyright (c) 2026 Dimitri Simon
+# 
+################################################################################
+
+
+from src.sentences import RuleSentencizer, covers
+
+
+def test_caseless_scripts_split():
+	assert RuleSentencizer("ar").split_sentences("ذهبت إلى السوق. اشتريت الخبز. ثم عدت إلى البيت.") == ["ذهبت إلى السوق.", "اشتريت الخبز.", "ثم عدت إلى البيت."]
+	assert RuleSentencizer("he").split_sentences("הלכתי לשוק. קניתי לחם. אחר כך חזרתי הביתה.") == ["הלכתי לשוק.", "קניתי לחם.", "אחר כך חזרתי הביתה."]
+	assert RuleSentencizer("hi").split_sentences("मैं बाजार गया। मैंने रोटी खरीदी।") == ["मैं बाजार गया।", "मैंने रोटी खरीदी।"]
+	assert RuleSentencizer("ar").split_sentences("هل ذهبت؟ نعم ذهبت.") == ["هل ذهبت؟", "نعم ذهبت."]
+
+
+def test_cased_scripts_keep_abbreviations():
+	assert RuleSentencizer("en").split_sentences("I met Dr. Smith. He was late. then he left.") == ["I met Dr. Smith.", "He was late. then he left."]
+
+
+def test_uncovered_languages():
+	assert not covers("th")
+	assert covers("ar") and covers("ja")